@@ -0,0 +1,337 @@
+"""Benchmarks for the refresh cycle and entity fan-out at large window counts.
+
+Synthetic ``getRoomInfo``/``getWindowInfo`` payloads (shaped like the
+README examples) are served to the real API client through its
+``_request`` seam, so no hub or network is involved. For each size the
+suite measures:
+
+* ``decode``: JSON decoding plus building ``NormanWindow``/``NormanRoom`` records
+* ``merge``: resolving room names, building the snapshot index and diffing it
+* ``refresh``: a full ``_async_update_data`` on the coordinator
+* ``fanout_<platform>_idle`` / ``_one`` / ``_all``: notifying one platform's
+  entities (``cover``, ``sensor`` or ``button``) after a refresh where no,
+  one or every blind moved, with only that platform listening
+* ``entities_<platform>`` and ``writes_<platform>_*``: how many entities the
+  platform has and how many state writes each of those fan-outs caused
+* ``peak_kib``: peak traced memory during one refresh
+
+Results are compared against ``baselines.json``; a timing more than
+``--tolerance`` times its baseline is reported as a regression and makes
+the run exit non-zero. Each timing is the fastest of at least ``--repeat``
+runs, and short timings are repeated until they add up to
+``MIN_SAMPLE_TIME``, which keeps scheduler noise out of the minimum.
+Timings depend on the machine, so regenerate baselines with
+``--update-baselines`` on the machine that runs the comparison.
+
+    python benchmarks/bench_refresh.py
+    python benchmarks/bench_refresh.py --sizes 10 100 --update-baselines
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.norman_blinds.api import (  # noqa: E402
+    NormanBlindsApiClient,
+    _json_loads,
+    _merge_windows,
+)
+from custom_components.norman_blinds.button import (  # noqa: E402
+    PRESET_BUTTONS,
+    NormanBlindsRoomPresetButton,
+)
+from custom_components.norman_blinds.const import (  # noqa: E402
+    ALLOWED_POSITIONS,
+    ROOM_INFO_ENDPOINT,
+    WINDOW_INFO_ENDPOINT,
+)
+from custom_components.norman_blinds.coordinator import (  # noqa: E402
+    NormanBlindsDataUpdateCoordinator,
+    build_snapshot_index,
+    diff_snapshots,
+)
+from custom_components.norman_blinds.cover import (  # noqa: E402
+    NormanBlindsCover,
+    NormanBlindsRoomCover,
+)
+from custom_components.norman_blinds.models import NormanRoom, NormanWindow  # noqa: E402
+from custom_components.norman_blinds.sensor import create_window_sensors  # noqa: E402
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+DEFAULT_SIZES = (10, 100, 1000, 5000)
+WINDOWS_PER_ROOM = 10
+# Metrics with these prefixes are counts, reported for context and not compared.
+COUNT_PREFIXES = ("entities_", "writes_")
+MIN_SAMPLE_TIME = 0.2  # seconds; short timings are repeated until they add up to this
+
+
+def room_payload(room_count: int) -> dict[str, Any]:
+    """Return a getRoomInfo body for ``room_count`` rooms."""
+
+    rooms = [
+        {
+            "groupname": ["Left", "Middle", "Right", "All", "group5"],
+            "Id": 10000 + index,
+            "Name": f"Room {index}",
+            "Color": index % 12,
+            "Style": 1,
+            "Sort": index,
+        }
+        for index in range(room_count)
+    ]
+    return {"totalRooms": len(rooms), "rooms": rooms}
+
+
+def window_payload(window_count: int, *, moved: int = 0, generation: int = 0) -> dict[str, Any]:
+    """Return a getWindowInfo body; the first ``moved`` blinds change position per generation."""
+
+    windows = []
+    for index in range(window_count):
+        position = ALLOWED_POSITIONS[(index + (generation if index < moved else 0)) % 8]
+        windows.append(
+            {
+                "Id": 20000 + index,
+                "Name": f"Id {index:04x}",
+                "Level": 0,
+                "Sort": index,
+                "RId": 10000 + index // WINDOWS_PER_ROOM,
+                "roomId": 10000 + index // WINDOWS_PER_ROOM,
+                "scenes": [{"Id": 0, "Position": 0, "Angle": 0}],
+                "groupId": 10,
+                "level": [0, 1, 0, 1, 0],
+                "levelsort": [0, 1, 0, 1, 0],
+                "battery": "100",
+                "position": position,
+                "angle": 0,
+                "model": 1,
+                "Rssi": 65,
+                "temp": 21,
+                "ver": "0.6.8",
+                "solar": 65535,
+                "usb": 0,
+                "speed": 0,
+                "model_detail": 0,
+            }
+        )
+    return {"totalWindow": len(windows), "windows": windows}
+
+
+class CannedApiClient(NormanBlindsApiClient):
+    """API client whose requests return canned response bodies."""
+
+    def __init__(self, bodies: dict[str, bytes]) -> None:
+        super().__init__(None, "127.0.0.1", "123456789")  # type: ignore[arg-type]
+        self.bodies = bodies
+
+    async def _request(self, endpoint: str, payload: Any = None, **kwargs: Any) -> Any:
+        return _json_loads(self.bodies[endpoint])
+
+
+def _enough(samples: list[float], repeat: int) -> bool:
+    """Return True once there are ``repeat`` samples covering ``MIN_SAMPLE_TIME``."""
+
+    return len(samples) >= repeat and sum(samples) >= MIN_SAMPLE_TIME
+
+
+def _timeit(func: Any, repeat: int) -> float:
+    """Return the fastest wall time of ``func()`` in seconds."""
+
+    samples: list[float] = []
+    while not _enough(samples, repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return min(samples)
+
+
+async def _async_timeit(func: Any, repeat: int) -> float:
+    """Return the fastest wall time of ``await func()`` in seconds."""
+
+    samples: list[float] = []
+    while not _enough(samples, repeat):
+        started = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - started)
+    return min(samples)
+
+
+async def run_size(hass: HomeAssistant, window_count: int, repeat: int) -> dict[str, float]:
+    """Run every benchmark for one window count."""
+
+    room_count = max(1, window_count // WINDOWS_PER_ROOM)
+    room_body = json.dumps(room_payload(room_count)).encode()
+    window_bodies = {
+        moved: [
+            json.dumps(window_payload(window_count, moved=moved, generation=generation)).encode()
+            for generation in range(2)
+        ]
+        for moved in (0, 1, window_count)
+    }
+    results: dict[str, float] = {}
+
+    def _decode() -> None:
+        rooms = [NormanRoom.from_payload(room) for room in _json_loads(room_body)["rooms"]]
+        windows = [
+            NormanWindow.from_payload(window)
+            for window in _json_loads(window_bodies[0][0])["windows"]
+        ]
+        assert rooms and windows
+
+    results["decode"] = _timeit(_decode, repeat)
+
+    rooms = [NormanRoom.from_payload(room) for room in _json_loads(room_body)["rooms"]]
+    windows = [
+        NormanWindow.from_payload(window) for window in _json_loads(window_bodies[0][0])["windows"]
+    ]
+    previous = {"rooms": rooms, "windows": windows}
+    previous.update(build_snapshot_index(previous))
+
+    def _merge() -> None:
+        _merge_windows(rooms, windows)
+        data: dict[str, Any] = {"rooms": rooms, "windows": windows}
+        data.update(build_snapshot_index(data))
+        diff_snapshots(previous, data)
+
+    results["merge"] = _timeit(_merge, repeat)
+
+    api = CannedApiClient(
+        {ROOM_INFO_ENDPOINT: room_body, WINDOW_INFO_ENDPOINT: window_bodies[0][0]}
+    )
+    api.read_freshness = 0
+    coordinator = NormanBlindsDataUpdateCoordinator(hass, api)
+    coordinator.data = await coordinator._async_update_data()
+
+    async def _refresh() -> None:
+        coordinator.data = await coordinator._async_update_data()
+
+    results["refresh"] = await _async_timeit(_refresh, repeat)
+
+    tracemalloc.start()
+    await _refresh()
+    results["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    # Entities as the platforms create them, listening through the coordinator.
+    writes = 0
+
+    def _count_write() -> None:
+        nonlocal writes
+        writes += 1
+
+    data = coordinator.data
+    platforms: dict[str, list[Any]] = {
+        "cover": [NormanBlindsRoomCover(coordinator, room) for room in data["rooms"]]
+        + [NormanBlindsCover(coordinator, window) for window in data["windows"]],
+        "sensor": [
+            sensor
+            for window in data["windows"]
+            for sensor in create_window_sensors(coordinator, window)
+        ],
+        "button": [
+            NormanBlindsRoomPresetButton(coordinator, room.id, room.name, description)
+            for room in data["rooms"]
+            for description in PRESET_BUTTONS
+        ],
+    }
+    for platform, entities in platforms.items():
+        unsubscribers = []
+        for entity in entities:
+            entity.async_write_ha_state = _count_write
+            unsubscribers.append(
+                coordinator.async_add_listener(
+                    entity._handle_coordinator_update, entity.coordinator_context
+                )
+            )
+
+        results[f"entities_{platform}"] = len(entities)
+        for name, moved in (("idle", 0), ("one", 1), ("all", window_count)):
+            generation = 0
+            samples: list[float] = []
+            while not _enough(samples, repeat):
+                generation ^= 1
+                api.bodies[WINDOW_INFO_ENDPOINT] = window_bodies[moved][generation]
+                coordinator.data = await coordinator._async_update_data()
+                writes = 0
+                started = time.perf_counter()
+                coordinator.async_update_listeners()
+                samples.append(time.perf_counter() - started)
+            results[f"fanout_{platform}_{name}"] = min(samples)
+            results[f"writes_{platform}_{name}"] = writes
+
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+    await api.async_close()
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]], baselines: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    """Print results next to baselines; return the regressions."""
+
+    regressions = []
+    for size, metrics in results.items():
+        print(f"\n{size} windows")
+        stored = baselines.get(size, {})
+        for metric, value in metrics.items():
+            baseline = stored.get(metric)
+            if metric.startswith(COUNT_PREFIXES):
+                print(f"  {metric:<20} {value:>12}")
+                continue
+            unit = "KiB" if metric == "peak_kib" else "ms"
+            shown = value if unit == "KiB" else value * 1000
+            line = f"  {metric:<20} {shown:>12.3f} {unit}"
+            if baseline:
+                ratio = value / baseline
+                line += f"   x{ratio:.2f} of baseline"
+                if ratio > tolerance:
+                    line += "  REGRESSION"
+                    regressions.append(f"{size}/{metric}")
+            print(line)
+    return regressions
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        results = {
+            str(size): await run_size(hass, size, args.repeat) for size in args.sizes
+        }
+        await hass.async_stop(force=True)
+
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    regressions = compare(results, baselines, args.tolerance)
+    if args.update_baselines:
+        baselines.update(results)
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaselines written to {BASELINES}")
+        return 0
+    if regressions:
+        print(f"\nRegressions over x{args.tolerance}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh cycle and entity fan-out benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=7, help="minimum runs per timing; the fastest is kept")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="allowed ratio to baseline")
+    parser.add_argument("--update-baselines", action="store_true")
+    sys.exit(asyncio.run(async_main(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
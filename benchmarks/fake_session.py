@@ -0,0 +1,68 @@
+"""Stand-ins for the aiohttp client session used by the benchmark scripts.
+
+The API client only calls ``session.post(url, json=..., timeout=...)`` as
+an async context manager and reads ``status``, ``headers``, ``cookies``,
+``charset``, ``read()`` and ``raise_for_status()`` from the response, so
+subclasses of ``FakeSession`` just implement ``async_exchange``.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from aiohttp import ClientResponseError
+from aiohttp.helpers import parse_mimetype
+
+
+class FakeResponse:
+    """The parts of an aiohttp response the API client reads.
+
+    ``charset`` comes from ``content_type`` the way aiohttp parses it, and
+    is None when the content type declares none.
+    """
+
+    def __init__(
+        self,
+        body: bytes,
+        status: int = 200,
+        *,
+        content_type: str | None = "application/json; charset=utf-8",
+    ) -> None:
+        self.status = status
+        self.headers: dict[str, str] = {"Content-Type": content_type} if content_type else {}
+        self.charset: str | None = (
+            parse_mimetype(content_type).parameters.get("charset") if content_type else None
+        )
+        self.cookies: dict[str, str] = {}
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise ClientResponseError(None, (), status=self.status)  # type: ignore[arg-type]
+
+
+class _Exchange:
+    """One POST, usable as ``async with session.post(...) as response``."""
+
+    def __init__(self, session: FakeSession, endpoint: str, payload: Any) -> None:
+        self._session = session
+        self._endpoint = endpoint
+        self._payload = payload
+
+    async def __aenter__(self) -> FakeResponse:
+        return await self._session.async_exchange(self._endpoint, self._payload)
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class FakeSession:
+    """Routes each POST to ``async_exchange`` with the endpoint name and payload."""
+
+    def post(self, url: str, *, json: Any = None, timeout: Any = None) -> _Exchange:
+        return _Exchange(self, url.rsplit("/", 1)[-1], json)
+
+    async def async_exchange(self, endpoint: str, payload: Any) -> FakeResponse:
+        raise NotImplementedError
@@ -0,0 +1,148 @@
+"""Replay a recorded cassette through the API client and coordinator.
+
+Cassettes are recorded in Home Assistant with the
+``norman_blinds.start_recording`` / ``norman_blinds.stop_recording``
+services. This script serves the recorded responses back, per endpoint
+and in recorded order, and runs one coordinator refresh per recorded
+``getWindowInfo`` exchange, so slow hubs and odd payloads from the field
+can be reproduced offline and a fix measured against the same traffic.
+
+``--latency-scale`` multiplies the recorded hub response times (``0``
+replays as fast as the client can go, which isolates client-side cost).
+Once an endpoint's recorded exchanges run out, its last one is repeated.
+
+    python benchmarks/replay_cassette.py norman_blinds_<entry>_<time>.json
+    python benchmarks/replay_cassette.py cassette.json --latency-scale 0 --profile
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter, deque
+import cProfile
+from pathlib import Path
+import pstats
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.norman_blinds.api import NormanBlindsApiClient  # noqa: E402
+from custom_components.norman_blinds.cassette import NormanBlindsCassette  # noqa: E402
+from custom_components.norman_blinds.coordinator import (  # noqa: E402
+    NormanBlindsDataUpdateCoordinator,
+)
+from fake_session import FakeResponse, FakeSession  # noqa: E402
+
+WINDOW_INFO = "getWindowInfo"
+
+
+class CassetteReplay(FakeSession):
+    """Serves a cassette's responses, endpoint by endpoint, in recorded order."""
+
+    def __init__(self, cassette: NormanBlindsCassette, *, latency_scale: float = 1.0) -> None:
+        self.latency_scale = latency_scale
+        self.served: Counter[str] = Counter()
+        self.hub_time = 0.0
+        self._queues: dict[str, deque[dict[str, Any]]] = {}
+        self._last: dict[str, dict[str, Any]] = {}
+        for exchange in cassette.exchanges:
+            self._queues.setdefault(exchange["endpoint"], deque()).append(exchange)
+
+    @property
+    def unplayed(self) -> dict[str, int]:
+        """Return how many recorded exchanges per endpoint were never requested."""
+
+        return {endpoint: len(queue) for endpoint, queue in self._queues.items() if queue}
+
+    async def async_exchange(self, endpoint: str, payload: Any) -> FakeResponse:
+        if queue := self._queues.get(endpoint):
+            self._last[endpoint] = queue.popleft()
+        exchange = self._last.get(endpoint)
+        if exchange is None:
+            raise LookupError(f"Cassette has no {endpoint} exchange")
+        delay = exchange["elapsed"] * self.latency_scale
+        if delay:
+            await asyncio.sleep(delay)
+        self.hub_time += delay
+        self.served[endpoint] += 1
+        return FakeResponse(
+            NormanBlindsCassette.exchange_body(exchange),
+            exchange["status"],
+            content_type=exchange.get("content_type"),
+        )
+
+
+async def async_replay(
+    cassette: NormanBlindsCassette, polls: int, latency_scale: float
+) -> tuple[CassetteReplay, list[float], int]:
+    """Run ``polls`` coordinator refreshes; return the replay, timings and failures."""
+
+    replay = CassetteReplay(cassette, latency_scale=latency_scale)
+    timings: list[float] = []
+    failures = 0
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        api = NormanBlindsApiClient(replay, cassette.host, "replay")  # type: ignore[arg-type]
+        # Every refresh should reach the cassette rather than a just-fetched result.
+        api.read_freshness = 0
+        coordinator = NormanBlindsDataUpdateCoordinator(hass, api)
+        for _ in range(polls):
+            started = time.perf_counter()
+            await coordinator.async_refresh()
+            timings.append(time.perf_counter() - started)
+            failures += not coordinator.last_update_success
+        await coordinator.async_shutdown()
+        await api.async_close()
+        await hass.async_stop(force=True)
+    return replay, timings, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a Norman hub cassette")
+    parser.add_argument("cassette", type=Path)
+    parser.add_argument(
+        "--latency-scale", type=float, default=1.0, help="multiplier for recorded hub latency"
+    )
+    parser.add_argument("--polls", type=int, help="refreshes to run (default: one per recorded poll)")
+    parser.add_argument("--profile", action="store_true", help="print the top functions by cumulative time")
+    args = parser.parse_args()
+
+    cassette = NormanBlindsCassette.load(args.cassette)
+    polls = args.polls or max(
+        1, sum(exchange["endpoint"] == WINDOW_INFO for exchange in cassette.exchanges)
+    )
+    print(
+        f"{args.cassette.name}: {len(cassette.exchanges)} exchanges from {cassette.host} "
+        f"recorded {cassette.recorded_at}; replaying {polls} polls"
+    )
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
+    replay, timings, failures = asyncio.run(async_replay(cassette, polls, args.latency_scale))
+    if profiler is not None:
+        profiler.disable()
+
+    total = sum(timings)
+    print(
+        f"refresh  median {statistics.median(timings) * 1000:.2f} ms  "
+        f"max {max(timings) * 1000:.2f} ms  total {total:.3f} s"
+    )
+    print(f"hub time {replay.hub_time:.3f} s  client time {max(0.0, total - replay.hub_time):.3f} s")
+    print(f"failed refreshes {failures}")
+    print("served   " + ", ".join(f"{name} {count}" for name, count in sorted(replay.served.items())))
+    if unplayed := replay.unplayed:
+        print("unplayed " + ", ".join(f"{name} {count}" for name, count in sorted(unplayed.items())))
+    if profiler is not None:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+
+if __name__ == "__main__":
+    main()
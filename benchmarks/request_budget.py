@@ -0,0 +1,296 @@
+"""Request budgets: how many hub calls each user action costs.
+
+Scripted scenarios run the real API client and coordinator against the
+in-process hub emulator (``tools/hub_emulator.py``) through a counting
+transport, on an event loop whose clock jumps straight to the next timer.
+An idle hour of polling or a minute of follow-up polls after a command
+therefore finishes in well under a second, and the counts are exactly
+reproducible.
+
+Each scenario has an upper bound on hub requests and on bytes exchanged
+(request plus response bodies); exceeding either is reported and makes
+the run exit non-zero. When a change lowers a count on purpose, tighten
+the matching entry in ``BUDGETS``.
+
+    python benchmarks/request_budget.py
+    python benchmarks/request_budget.py --scenario open_room --verbose
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.norman_blinds.api import NormanBlindsApiClient  # noqa: E402
+from custom_components.norman_blinds.coordinator import (  # noqa: E402
+    NormanBlindsDataUpdateCoordinator,
+)
+from fake_session import FakeResponse, FakeSession  # noqa: E402
+from hub_emulator import NormanHubEmulator  # noqa: E402
+
+ROOMS = 6
+WINDOWS_PER_ROOM = 4
+HUB_LATENCY = 0.05  # seconds of virtual time per request
+TRAVEL_TIME = 20  # seconds for a full 0-100 move
+SESSION_LIFETIME = 900  # seconds before the hub answers {"error": -2}
+SETTLE_TIME = 120  # seconds of follow-up polling counted after a command
+
+# Upper bounds per scenario: (requests, bytes). Request counts are exact
+# for the current code; byte bounds leave ~10% for payload shape changes.
+BUDGETS: dict[str, tuple[int, int]] = {
+    "startup": (3, 11_000),
+    "idle_hour": (18, 125_000),
+    "open_one": (8, 68_000),
+    "open_room": (9, 77_000),
+    "scene_5_rooms": (14, 87_000),
+    "scene_session_expired": (16, 87_000),
+}
+
+
+class VirtualClock:
+    """Monotonic time that jumps to the next timer instead of sleeping.
+
+    ``install`` points ``time.monotonic`` (used by asyncio and by the
+    integration) at the virtual clock and wraps the loop's selector so a
+    wait for the next timer advances the clock by the timeout and polls
+    without blocking. Only suitable when no real I/O is outstanding.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self._real_monotonic = time.monotonic
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def install(self, loop: asyncio.AbstractEventLoop) -> None:
+        time.monotonic = self.monotonic
+        selector = loop._selector  # type: ignore[attr-defined]
+        real_select = selector.select
+
+        def _select(timeout: float | None = None) -> Any:
+            if timeout is None:
+                return real_select(None)
+            self.now += timeout
+            return real_select(0)
+
+        selector.select = _select
+
+    def uninstall(self) -> None:
+        time.monotonic = self._real_monotonic
+
+
+class CountingTransport(FakeSession):
+    """Stands in for the client session, serving POSTs from the emulator.
+
+    Keeps the session cookie the way the real cookie jar does and counts
+    requests per endpoint and bytes in each direction.
+    """
+
+    def __init__(self, hub: NormanHubEmulator, latency: float) -> None:
+        self.hub = hub
+        self.latency = latency
+        self.requests: Counter[str] = Counter()
+        self.bytes = 0
+        self.log: list[tuple[float, str]] = []
+        self._cookie: str | None = None
+
+    async def async_exchange(self, endpoint: str, payload: Any) -> FakeResponse:
+        await asyncio.sleep(self.latency)
+        data, token = self.hub.respond(endpoint, payload or {}, self._cookie)
+        if token is not None:
+            self._cookie = token
+        body = json.dumps(data).encode()
+        self.requests[endpoint] += 1
+        self.bytes += len(json.dumps(payload or {})) + len(body)
+        self.log.append((time.monotonic(), endpoint))
+        return FakeResponse(body)
+
+    def reset(self) -> None:
+        self.requests.clear()
+        self.bytes = 0
+        self.log.clear()
+
+
+@dataclass
+class Harness:
+    """Everything a scenario drives, already through startup."""
+
+    hub: NormanHubEmulator
+    transport: CountingTransport
+    api: NormanBlindsApiClient
+    coordinator: NormanBlindsDataUpdateCoordinator
+
+    def room_ids(self, count: int) -> list[Any]:
+        return [room["Id"] for room in self.hub.rooms[:count]]
+
+    def room_window_ids(self, room_id: Any) -> list[Any]:
+        return [window.id for window in self.coordinator.get_room_windows(room_id)]
+
+    async def async_settle(self, seconds: float = SETTLE_TIME) -> None:
+        """Let polls and follow-ups run for ``seconds`` of virtual time."""
+
+        await asyncio.sleep(seconds)
+
+
+async def _scenario_startup(harness: Harness) -> None:
+    """Counted from the first request; covers login and the first poll."""
+
+
+async def _scenario_idle_hour(harness: Harness) -> None:
+    await harness.async_settle(3600)
+
+
+async def _scenario_open_one(harness: Harness) -> None:
+    window_id = harness.room_window_ids(harness.room_ids(1)[0])[0]
+    await harness.api.async_set_window_position(window_id, 0)
+    harness.coordinator.async_track_command({window_id: 0})
+    await harness.async_settle()
+
+
+async def _scenario_open_room(harness: Harness) -> None:
+    room_id = harness.room_ids(1)[0]
+    await harness.api.async_set_room_position(room_id, 0)
+    harness.coordinator.async_track_command(
+        {window_id: 0 for window_id in harness.room_window_ids(room_id)}
+    )
+    await harness.async_settle()
+
+
+async def _scenario_scene(harness: Harness) -> None:
+    room_ids = harness.room_ids(5)
+    await asyncio.gather(
+        *(harness.api.async_set_room_preset(room_id, "view") for room_id in room_ids)
+    )
+    harness.coordinator.async_track_command(
+        {
+            window_id: None
+            for room_id in room_ids
+            for window_id in harness.room_window_ids(room_id)
+        }
+    )
+    await harness.async_settle()
+
+
+async def _scenario_scene_session_expired(harness: Harness) -> None:
+    harness.hub.expire_sessions()
+    await _scenario_scene(harness)
+
+
+SCENARIOS: dict[str, Callable[[Harness], Awaitable[None]]] = {
+    "startup": _scenario_startup,
+    "idle_hour": _scenario_idle_hour,
+    "open_one": _scenario_open_one,
+    "open_room": _scenario_open_room,
+    "scene_5_rooms": _scenario_scene,
+    "scene_session_expired": _scenario_scene_session_expired,
+}
+
+
+async def _async_run_scenario(name: str) -> CountingTransport:
+    """Start a fresh Home Assistant, hub and client, run one scenario and return its counts."""
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            return await _async_run_scenario_in(hass, name)
+        finally:
+            await hass.async_stop(force=True)
+
+
+async def _async_run_scenario_in(hass: HomeAssistant, name: str) -> CountingTransport:
+    """Run one scenario against a fresh hub and client in ``hass``."""
+
+    # Home Assistant spreads coordinator polls with a random sub-second offset.
+    random.seed(name)
+    hub = NormanHubEmulator(
+        rooms=ROOMS,
+        windows_per_room=WINDOWS_PER_ROOM,
+        travel_time=TRAVEL_TIME,
+        session_lifetime=SESSION_LIFETIME,
+        seed=1,
+    )
+    transport = CountingTransport(hub, HUB_LATENCY)
+    api = NormanBlindsApiClient(transport, "hub.invalid", hub.password)  # type: ignore[arg-type]
+    coordinator = NormanBlindsDataUpdateCoordinator(hass, api)
+    # Entities keep the coordinator polling on its schedule.
+    unsubscribe = coordinator.async_add_listener(lambda: None)
+    await coordinator.async_refresh()
+    if name != "startup":
+        transport.reset()
+
+    try:
+        await SCENARIOS[name](Harness(hub, transport, api, coordinator))
+    finally:
+        unsubscribe()
+        await coordinator.async_shutdown()
+        await api.async_close()
+    return transport
+
+
+def _report(name: str, transport: CountingTransport, verbose: bool) -> bool:
+    """Print one scenario's counts; return False if it is over budget."""
+
+    total = sum(transport.requests.values())
+    max_requests, max_bytes = BUDGETS.get(name, (None, None))
+    over = (max_requests is not None and total > max_requests) or (
+        max_bytes is not None and transport.bytes > max_bytes
+    )
+    budget = f"budget {max_requests} / {max_bytes} B" if max_requests is not None else "no budget"
+    print(
+        f"{name:<22} {total:>4} requests {transport.bytes:>8} B   {budget}"
+        + ("  OVER BUDGET" if over else "")
+    )
+    breakdown = ", ".join(f"{endpoint} {count}" for endpoint, count in sorted(transport.requests.items()))
+    print(f"{'':<22} {breakdown}")
+    if verbose:
+        for at, endpoint in transport.log:
+            print(f"{'':<22}   {at:9.2f}s {endpoint}")
+    return not over
+
+
+def run_scenario(name: str) -> CountingTransport:
+    """Run one scenario on its own event loop, virtual clock and Home Assistant.
+
+    Nothing is shared between scenarios, so each one's counts are the same
+    whichever scenarios run before it.
+    """
+
+    clock = VirtualClock()
+    loop = asyncio.new_event_loop()
+    clock.install(loop)
+    try:
+        return loop.run_until_complete(_async_run_scenario(name))
+    finally:
+        clock.uninstall()
+        loop.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hub request budgets per user action")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS))
+    parser.add_argument("--verbose", action="store_true", help="list every request with its time")
+    args = parser.parse_args()
+
+    results = {name: run_scenario(name) for name in args.scenario or SCENARIOS}
+    within = [_report(name, transport, args.verbose) for name, transport in results.items()]
+    sys.exit(0 if all(within) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,51 +2,173 @@
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
 from .api import NormanBlindsApiClient
-from .const import CONF_HOST, CONF_PASSWORD, DEFAULT_PASSWORD, DOMAIN
+from .const import (
+    CONF_COMMAND_SETTLE_DELAY,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_HOST,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_PASSWORD,
+    CONF_ROOM_CACHE_TTL,
+    DEFAULT_COMMAND_SETTLE_DELAY,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_PASSWORD,
+    DEFAULT_ROOM_CACHE_TTL,
+    DOMAIN,
+    LOGGER,
+    SERVICE_REFRESH_TOPOLOGY,
+    SERVICE_START_RECORDING,
+    SERVICE_STOP_RECORDING,
+    STORAGE_VERSION,
+)
+from .connection import NormanBlindsHubConnection
 from .coordinator import NormanBlindsDataUpdateCoordinator
 
 PLATFORMS: list[Platform] = [Platform.COVER, Platform.SENSOR, Platform.BUTTON]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Register integration-wide services."""
+
+    async def _async_refresh_topology(call: ServiceCall) -> None:
+        """Drop cached room info on every hub and refetch it now."""
+
+        for data in hass.data.get(DOMAIN, {}).values():
+            data["api"].invalidate_room_cache()
+            await data["coordinator"].async_request_refresh()
+
+    async def _async_start_recording(call: ServiceCall) -> None:
+        """Start recording the exchanges with every hub."""
+
+        for data in hass.data.get(DOMAIN, {}).values():
+            data["api"].start_recording()
+
+    async def _async_stop_recording(call: ServiceCall) -> None:
+        """Stop recording and write one cassette per hub to the config directory."""
+
+        stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+        for entry_id, data in hass.data.get(DOMAIN, {}).items():
+            if (cassette := data["api"].stop_recording()) is None:
+                continue
+            path = hass.config.path(f"{DOMAIN}_{entry_id}_{stamp}.json")
+            await hass.async_add_executor_job(cassette.save, path)
+            LOGGER.info("Saved %s recorded exchanges to %s", len(cassette.exchanges), path)
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH_TOPOLOGY, _async_refresh_topology)
+    hass.services.async_register(DOMAIN, SERVICE_START_RECORDING, _async_start_recording)
+    hass.services.async_register(DOMAIN, SERVICE_STOP_RECORDING, _async_stop_recording)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Norman Blinds from a config entry."""
 
     hass.data.setdefault(DOMAIN, {})
 
-    session = async_get_clientsession(hass)
+    max_concurrent_requests = entry.options.get(
+        CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+    )
+    connection = NormanBlindsHubConnection(max_connections=max_concurrent_requests)
+
+    async def _async_close_connection(_: Event) -> None:
+        await connection.async_close()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_connection)
+    )
+
     api = NormanBlindsApiClient(
-        session,
+        connection.session,
         entry.data[CONF_HOST],
         entry.data.get(CONF_PASSWORD, DEFAULT_PASSWORD),
+        max_concurrent_requests=max_concurrent_requests,
+        room_cache_ttl=entry.options.get(CONF_ROOM_CACHE_TTL, DEFAULT_ROOM_CACHE_TTL),
+        command_settle_delay=entry.options.get(
+            CONF_COMMAND_SETTLE_DELAY, DEFAULT_COMMAND_SETTLE_DELAY
+        ),
     )
 
-    coordinator = NormanBlindsDataUpdateCoordinator(hass, api)
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = NormanBlindsDataUpdateCoordinator(
+        hass,
+        api,
+        store=Store(hass, STORAGE_VERSION, _storage_key(entry)),
+        fast_interval=entry.options.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL),
+        max_interval=entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+    )
+    if await coordinator.async_restore():
+        # Entities come up from the saved snapshot; the hub is queried in the background.
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await connection.async_close()
+            raise
+
+    @callback
+    def _async_save_on_stop(_: Event) -> None:
+        # Pending saves are flushed on the final write, so the latest session cookie survives.
+        coordinator.async_save_snapshot()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_save_on_stop)
+    )
 
     hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
+        "connection": connection,
         "coordinator": coordinator,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
 
+def _storage_key(entry: ConfigEntry) -> str:
+    """Return the storage key for an entry's saved snapshot."""
+
+    return f"{DOMAIN}.{entry.entry_id}"
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so changed options reach the API client."""
+
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if data is not None:
+            await data["coordinator"].async_shutdown()
+            await data["api"].async_close()
+            await data["connection"].async_close()
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the saved snapshot when the entry is removed."""
+
+    await Store(hass, STORAGE_VERSION, _storage_key(entry)).async_remove()
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, entry: ConfigEntry, device_entry: dr.DeviceEntry
 ) -> bool:
@@ -63,10 +185,7 @@ async def async_remove_config_entry_device(
 
     coordinator: NormanBlindsDataUpdateCoordinator = data["coordinator"]
     known_ids = {(DOMAIN, "hub")}
-    for item in coordinator.data.get("windows", []):
-        window = item.get("window") or {}
-        window_id = window.get("Id") or window.get("id")
-        if window_id is not None:
-            known_ids.add((DOMAIN, f"window_{window_id}"))
+    for window_id in coordinator.data.get("windows_by_id", {}):
+        known_ids.add((DOMAIN, f"window_{window_id}"))
 
     return device_entry.identifiers.isdisjoint(known_ids)
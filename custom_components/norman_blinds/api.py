@@ -2,14 +2,38 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+import codecs
+import contextlib
+import json
+import logging
+import statistics
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from typing import Any, TypeVar
+
+from aiohttp import (
+    ClientConnectorError,
+    ClientOSError,
+    ClientSession,
+    ClientTimeout,
+    ServerDisconnectedError,
+)
+
+from yarl import URL
 
-from aiohttp import ClientSession, ClientTimeout
+try:  # Optional fast JSON backend; Home Assistant ships orjson.
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None  # type: ignore[assignment]
 
 from .const import (
     ALLOWED_POSITIONS,
     DEFAULT_APP_VERSION,
-    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_COMMAND_SETTLE_DELAY,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_READ_FRESHNESS,
+    DEFAULT_ROOM_CACHE_TTL,
     LOGGER,
     LOGIN_ENDPOINT,
     REMOTE_CONTROL_ENDPOINT,
@@ -17,8 +41,61 @@ from .const import (
     ROOM_PRESETS,
     ROOM_REMOTE_CONTROL_LID,
     ROOM_INFO_ENDPOINT,
+    SESSION_LIFETIME_SAMPLES,
+    SESSION_MIN_LIFETIME,
+    SESSION_RENEW_MARGIN,
+    SESSION_RENEW_RETRY,
     WINDOW_INFO_ENDPOINT,
 )
+from .cassette import NormanBlindsCassette
+from .circuit_breaker import STATE_OPEN, NormanBlindsCircuitBreaker
+from .command_queue import NormanBlindsCommandQueue
+from .metrics import (
+    LOGIN_INITIAL,
+    LOGIN_PROBE,
+    LOGIN_RELOGIN,
+    LOGIN_RENEWAL,
+    NormanBlindsLatencyTracker,
+    NormanBlindsRequestStats,
+)
+from .models import NormanRoom, NormanWindow
+from .scheduler import (
+    PRIORITY_COMMAND,
+    PRIORITY_DIAGNOSTIC,
+    PRIORITY_POLL,
+    PRIORITY_PRESET,
+    NormanBlindsRequestScheduler,
+)
+
+
+_T = TypeVar("_T")
+
+# Errors meaning the hub did not answer at all, as opposed to answering with an error.
+_UNREACHABLE_ERRORS = (ClientOSError, ServerDisconnectedError, asyncio.TimeoutError)
+
+
+def _response_encoding(charset: str | None) -> str:
+    """Return the codec for a declared response charset; missing or unknown means UTF-8."""
+
+    if not charset:
+        return "utf-8"
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        LOGGER.debug("Unknown response charset %r; decoding as UTF-8", charset)
+        return "utf-8"
+
+
+def _json_loads(body: bytes, encoding: str = "utf-8") -> Any:
+    """Decode a JSON response body, preferring orjson when it is available.
+
+    Bodies in an encoding other than UTF-8 are decoded to text first.
+    """
+
+    data: bytes | str = body if encoding == "utf-8" else body.decode(encoding)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class NormanBlindsApiError(Exception):
@@ -29,18 +106,68 @@ class NormanBlindsAuthError(NormanBlindsApiError):
     """Raised when authentication fails."""
 
 
+class NormanBlindsHubUnavailableError(NormanBlindsApiError):
+    """Raised without contacting the hub while the circuit breaker is open."""
+
+
 class NormanBlindsApiClient:
-    """Thin async client for the local Norman gateway."""
+    """Thin async client for the local Norman gateway.
 
-    def __init__(self, session: ClientSession, host: str, password: str) -> None:
+    Every request goes through one per-hub scheduler, so user commands are
+    sent ahead of queued polls and the hub never sees more than
+    ``max_concurrent_requests`` at once.
+
+    The client learns how long hub sessions last from the expirations it
+    observes and logs in again shortly before the next one would expire,
+    while no command is waiting, so commands do not pay for a re-login.
+
+    Consecutive connection failures trip a circuit breaker; while it is
+    open, requests fail immediately instead of each waiting out the
+    request timeout, and a single login probe checks the hub on a backoff.
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        host: str,
+        password: str,
+        *,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        room_cache_ttl: float = DEFAULT_ROOM_CACHE_TTL,
+        command_settle_delay: float = DEFAULT_COMMAND_SETTLE_DELAY,
+        read_freshness: float = DEFAULT_READ_FRESHNESS,
+    ) -> None:
         self._session = session
         self._host = host.rstrip("/")
         self._password = password
         self._login_lock = asyncio.Lock()
         self._logged_in = False
+        self._session_generation = 0
+        self.reconnects = 0
+        self.breaker = NormanBlindsCircuitBreaker()
+        self._probe_handle: asyncio.TimerHandle | None = None
+        self._session_started: float | None = None
+        self._session_confirmed: float | None = None
+        self._session_lifetimes: deque[float] = deque(maxlen=SESSION_LIFETIME_SAMPLES)
+        self._renew_handle: asyncio.TimerHandle | None = None
+        self._background_tasks: set[asyncio.Task[None]] = set()
         self._app_version = DEFAULT_APP_VERSION
         self._gateway_info: dict[str, Any] = {}
-        self._timeout = ClientTimeout(total=DEFAULT_REQUEST_TIMEOUT)
+        self.latency = NormanBlindsLatencyTracker()
+        self.stats = NormanBlindsRequestStats()
+        self.cassette: NormanBlindsCassette | None = None
+        self._scheduler = NormanBlindsRequestScheduler(max_concurrent_requests)
+        self.read_freshness = read_freshness
+        self.room_cache_ttl = room_cache_ttl
+        self._rooms_cache: list[NormanRoom] | None = None
+        self._rooms_fetched_at = 0.0
+        self._unknown_room_ids: set[Any] = set()
+        self._commands = NormanBlindsCommandQueue(
+            self._async_send_window_position,
+            self._async_send_room_position,
+            self._async_send_room_preset,
+            settle_delay=command_settle_delay,
+        )
 
     @property
     def base_url(self) -> str:
@@ -59,51 +186,212 @@ class NormanBlindsApiClient:
             return f"{self.base_url}{endpoint}"
         return f"{self.base_url}/{endpoint}"
 
-    async def _login(self, *, force: bool = False) -> None:
-        """Authenticate and persist cookies for subsequent requests."""
+    @property
+    def session_generation(self) -> int:
+        """Return how many times the client has logged in."""
+
+        return self._session_generation
+
+    @property
+    def session_lifetime(self) -> float | None:
+        """Return the learned hub session lifetime in seconds, if one was observed."""
+
+        if not self._session_lifetimes:
+            return None
+        return statistics.median(self._session_lifetimes)
+
+    @property
+    def session_diagnostics(self) -> dict[str, Any]:
+        """Return session state for diagnostics."""
+
+        return {
+            "logged_in": self._logged_in,
+            "generation": self._session_generation,
+            "age": (
+                round(time.monotonic() - self._session_started, 1)
+                if self._session_started is not None
+                else None
+            ),
+            "learned_lifetime": round(lifetime, 1) if (lifetime := self.session_lifetime) else None,
+            "observed_lifetimes": [round(lifetime, 1) for lifetime in self._session_lifetimes],
+        }
+
+    def _note_session_expired(self, generation: int) -> None:
+        """Record how long session ``generation`` lasted before the hub rejected it.
+
+        The session expired somewhere between its last accepted request and
+        the rejected one, which can be a whole poll interval later, so the
+        age at the last accepted request is learned: it never overestimates
+        the lifetime, and renewal then lands before the hub expires a session.
+        """
+
+        # A restored session's start time is unknown, so it says nothing about the lifetime.
+        if (
+            self._session_started is None
+            or self._session_confirmed is None
+            or generation != self._session_generation
+        ):
+            return
+        lifetime = self._session_confirmed - self._session_started
+        if lifetime < SESSION_MIN_LIFETIME:
+            # Sessions dropped this early were ended by the hub (e.g. a reboot), not aged out.
+            LOGGER.debug("Session %s ended after %.0fs; not learned", generation, lifetime)
+            return
+        self._session_lifetimes.append(lifetime)
+        LOGGER.debug(
+            "Session %s was last accepted at %.0fs and has expired; learned lifetime is now %.0fs",
+            generation,
+            lifetime,
+            self.session_lifetime,
+        )
+
+    def export_session(self) -> dict[str, Any]:
+        """Return the session cookies and learned state so a restart can reuse them."""
+
+        cookies = self._session.cookie_jar.filter_cookies(URL(self.base_url))
+        return {
+            "cookies": {name: morsel.value for name, morsel in cookies.items()},
+            "gateway": self._gateway_info,
+            "lifetimes": list(self._session_lifetimes),
+        }
+
+    def restore_session(self, stored: dict[str, Any]) -> None:
+        """Reuse a session saved by ``export_session``.
+
+        The restored session is treated as logged in; if the hub has since
+        expired it, the first request re-logs in as usual.
+        """
+
+        self._session_lifetimes.extend(stored.get("lifetimes") or ())
+        self._gateway_info = stored.get("gateway") or self._gateway_info
+        if cookies := stored.get("cookies"):
+            self._session.cookie_jar.update_cookies(cookies, URL(self.base_url))
+            self._logged_in = True
+
+    def _schedule_session_renewal(self, delay: float | None = None) -> None:
+        """Arrange a login shortly before the current session is expected to expire."""
+
+        if self._renew_handle is not None:
+            self._renew_handle.cancel()
+            self._renew_handle = None
+        if delay is None:
+            if (lifetime := self.session_lifetime) is None:
+                return
+            # Never renew more often than every half lifetime, even for very short sessions.
+            delay = max(lifetime / 2, lifetime - SESSION_RENEW_MARGIN)
+        self._renew_handle = asyncio.get_running_loop().call_later(
+            delay, self._start_session_renewal
+        )
+
+    def _start_session_renewal(self) -> None:
+        """Timer callback: renew the session unless commands are waiting."""
+
+        self._renew_handle = None
+        if not self.breaker.allows_requests:
+            return
+        if self._commands.pending_count or self._scheduler.queue_depth:
+            self._schedule_session_renewal(SESSION_RENEW_RETRY)
+            return
+        task = asyncio.get_running_loop().create_task(self._async_renew_session())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _async_renew_session(self) -> None:
+        """Log in again at diagnostic priority before the hub expires the session."""
+
+        generation = self._session_generation
+        LOGGER.debug("Renewing session %s before it expires", generation)
+        try:
+            await self._scheduler.async_run(
+                PRIORITY_DIAGNOSTIC,
+                lambda: self._login(stale_generation=generation, reason=LOGIN_RENEWAL),
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            # The next request will log in on demand; try again on the usual schedule.
+            LOGGER.debug("Session renewal failed: %s", err)
+            self._schedule_session_renewal()
+
+    async def _login(
+        self, *, stale_generation: int | None = None, reason: str | None = None
+    ) -> None:
+        """Authenticate and persist cookies for subsequent requests.
+
+        Pass ``stale_generation`` to replace a session that was rejected; if
+        another caller already replaced it, this returns without logging in
+        again, so N requests failing together cause a single login.
+        ``reason`` labels the login in the request stats; by default it is a
+        first login, or a re-login when ``stale_generation`` is given.
+        """
 
         async with self._login_lock:
-            if self._logged_in and not force:
+            if self._logged_in and (
+                stale_generation is None or stale_generation != self._session_generation
+            ):
                 return
 
             url = self._build_url(LOGIN_ENDPOINT)
             payload: dict[str, Any] = {"password": self._password, "app_version": self._app_version}
-            masked_payload = {**payload, "password": "***"}
-            LOGGER.debug("Posting login payload to %s: %s", url, masked_payload)
-
-            async with self._session.post(url, json=payload, timeout=self._timeout) as response:
-                if response.status in (401, 403):
-                    raise NormanBlindsAuthError("Invalid credentials for Norman gateway")
-                response.raise_for_status()
-                login_body = await response.text()
-                LOGGER.debug(
-                    "Login response status: %s, headers: %s, body: %s",
-                    response.status,
-                    dict(response.headers),
-                    login_body,
-                )
-                login_data: Any | None = None
-                try:
-                    login_data = await response.json(content_type=None)
-                except Exception:  # pylint: disable=broad-except
-                    login_data = None
-
-                if isinstance(login_data, dict):
-                    error_code = login_data.get("errorCode", 0)
-                    if error_code not in (None, 0, "0"):
-                        raise NormanBlindsAuthError(f"Login failed, errorCode: {error_code}")
-                    self._gateway_info = {
-                        "hubName": login_data.get("hubName"),
-                        "hubId": login_data.get("hubId"),
-                        "swVer": login_data.get("swVer"),
-                    }
-
-                self._logged_in = True
-                LOGGER.debug(
-                    "Login succeeded with app_version %s, session cookie jar keys: %s",
-                    self._app_version,
-                    list(response.cookies.keys()),
-                )
+            debug = LOGGER.isEnabledFor(logging.DEBUG)
+            if debug:
+                LOGGER.debug("Posting login payload to %s: %s", url, {**payload, "password": "***"})
+
+            async def _send() -> tuple[bytes, str | None]:
+                with self._timed(LOGIN_ENDPOINT) as timeout:
+                    started = time.monotonic()
+                    async with self._session.post(url, json=payload, timeout=timeout) as response:
+                        if response.status in (401, 403):
+                            raise NormanBlindsAuthError("Invalid credentials for Norman gateway")
+                        response.raise_for_status()
+                        body = await response.read()
+                        self.stats.record_response(LOGIN_ENDPOINT, len(body))
+                        if self.cassette is not None:
+                            self.cassette.record(
+                                LOGIN_ENDPOINT,
+                                payload,
+                                response.status,
+                                body,
+                                time.monotonic() - started,
+                                content_type=response.headers.get("Content-Type"),
+                            )
+                        if debug:
+                            LOGGER.debug(
+                                "Login response status: %s, headers: %s, body: %s, cookie jar keys: %s",
+                                response.status,
+                                dict(response.headers),
+                                body,
+                                list(response.cookies.keys()),
+                            )
+                        return body, response.charset
+
+            login_body, charset = await self._async_with_reconnect(LOGIN_ENDPOINT, _send)
+
+            try:
+                login_data: Any | None = _json_loads(login_body, _response_encoding(charset))
+            except ValueError:
+                login_data = None
+
+            if isinstance(login_data, dict):
+                error_code = login_data.get("errorCode", 0)
+                if error_code not in (None, 0, "0"):
+                    raise NormanBlindsAuthError(f"Login failed, errorCode: {error_code}")
+                self._gateway_info = {
+                    "hubName": login_data.get("hubName"),
+                    "hubId": login_data.get("hubId"),
+                    "swVer": login_data.get("swVer"),
+                }
+
+            self._logged_in = True
+            self._session_generation += 1
+            self._session_started = self._session_confirmed = time.monotonic()
+            self.stats.record_login(
+                reason or (LOGIN_INITIAL if stale_generation is None else LOGIN_RELOGIN)
+            )
+            self._schedule_session_renewal()
+            LOGGER.debug(
+                "Login succeeded with app_version %s (session %s)",
+                self._app_version,
+                self._session_generation,
+            )
 
     async def _ensure_login(self) -> None:
         """Log in if we do not already have cookies."""
@@ -112,6 +400,113 @@ class NormanBlindsApiClient:
             await self._login()
 
     async def _request(
+        self,
+        endpoint: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        priority: int = PRIORITY_POLL,
+        stale_generation: int | None = None,
+    ) -> Any:
+        """Queue a POST to the gateway behind any higher-priority requests.
+
+        The login (replacing session ``stale_generation`` when given) and
+        any re-login retry run in the same slot as the request itself.
+        """
+
+        self._raise_if_unavailable()
+
+        async def _job() -> Any:
+            # The breaker may have opened while this request was queued.
+            self._raise_if_unavailable()
+            if stale_generation is not None:
+                await self._login(stale_generation=stale_generation)
+            return await self._async_post(endpoint, payload)
+
+        return await self._scheduler.async_run(priority, _job)
+
+    def _raise_if_unavailable(self) -> None:
+        """Fail fast while the circuit breaker is refusing requests."""
+
+        if not self.breaker.allows_requests:
+            raise NormanBlindsHubUnavailableError(
+                f"Norman hub at {self._host} is unreachable; retrying in the background"
+            )
+
+    @contextlib.contextmanager
+    def _timed(self, endpoint: str) -> Iterator[ClientTimeout]:
+        """Yield the adaptive timeout for ``endpoint`` and record how long the request took."""
+
+        timeout = self.latency.timeout_for(endpoint)
+        started = time.monotonic()
+        try:
+            yield ClientTimeout(total=timeout)
+        except asyncio.TimeoutError:
+            LOGGER.debug("%s timed out after %.1fs", endpoint, timeout)
+            self.latency.record(endpoint, timeout)
+            self.stats.record_timeout(endpoint)
+            raise
+        except Exception:
+            self.stats.record_error(endpoint)
+            raise
+        self.latency.record(endpoint, time.monotonic() - started)
+
+    async def _async_with_reconnect(
+        self, endpoint: str, send: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Run ``send`` for ``endpoint``, repeating it once if the hub closed a pooled connection.
+
+        The hub drops idle keep-alive sockets without warning, so the first
+        request after a pause can fail on a dead connection; the retry gets
+        a fresh one. Failures to connect at all are not retried. The outcome
+        is reported to the circuit breaker.
+        """
+
+        try:
+            try:
+                result = await send()
+            except ClientConnectorError:
+                raise
+            except (ServerDisconnectedError, ClientOSError) as err:
+                self.reconnects += 1
+                self.stats.record_retry(endpoint)
+                LOGGER.debug("Hub closed the connection (%s); retrying on a new one", err)
+                result = await send()
+        except _UNREACHABLE_ERRORS:
+            self.breaker.record_failure()
+            if self.breaker.state == STATE_OPEN and self._probe_handle is None:
+                self._probe_handle = asyncio.get_running_loop().call_later(
+                    self.breaker.backoff, self._start_probe
+                )
+            raise
+        except Exception:
+            # Any answer, even an error status, shows the hub is reachable.
+            self.breaker.record_success()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _start_probe(self) -> None:
+        """Timer callback: send the half-open probe."""
+
+        self._probe_handle = None
+        self.breaker.start_probe()
+        task = asyncio.get_running_loop().create_task(self._async_probe())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _async_probe(self) -> None:
+        """Log in once to find out whether the hub is back."""
+
+        generation = self._session_generation
+        try:
+            await self._scheduler.async_run(
+                PRIORITY_DIAGNOSTIC,
+                lambda: self._login(stale_generation=generation, reason=LOGIN_PROBE),
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            LOGGER.debug("Hub probe failed: %s", err)
+
+    async def _async_post(
         self,
         endpoint: str,
         payload: dict[str, Any] | None = None,
@@ -122,62 +517,110 @@ class NormanBlindsApiClient:
         """POST to the gateway, refreshing authentication on 401."""
 
         await self._ensure_login()
+        generation = self._session_generation
+        sent = time.monotonic()
         url = self._build_url(endpoint)
-        LOGGER.debug(
-            "Posting to %s with payload %s",
-            url,
-            payload or {},
-        )
+        debug = LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            LOGGER.debug("Posting to %s with payload %s", url, payload or {})
+
+        # Read the body once and release the connection before any re-login/retry.
+        async def _send() -> tuple[int, bytes, str | None]:
+            with self._timed(endpoint) as timeout:
+                started = time.monotonic()
+                async with self._session.post(
+                    url, json=payload or {}, timeout=timeout
+                ) as response:
+                    body = await response.read()
+                    self.stats.record_response(endpoint, len(body))
+                    if self.cassette is not None:
+                        self.cassette.record(
+                            endpoint,
+                            payload or {},
+                            response.status,
+                            body,
+                            time.monotonic() - started,
+                            content_type=response.headers.get("Content-Type"),
+                        )
+                    if debug:
+                        LOGGER.debug(
+                            "Response status for %s: %s, headers: %s, body: %s",
+                            endpoint,
+                            response.status,
+                            dict(response.headers),
+                            body,
+                        )
+                    if response.status != 401:
+                        response.raise_for_status()
+                    return response.status, body, response.charset
+
+        status, body, charset = await self._async_with_reconnect(endpoint, _send)
+
+        if status == 401:
+            LOGGER.info("Session expired, retrying login")
+            if not allow_reauth:
+                raise NormanBlindsAuthError("Authentication failed after retry")
+            self._note_session_expired(generation)
+            await self._login(stale_generation=generation)
+            self.stats.record_retry(endpoint)
+            return await self._async_post(
+                endpoint, payload, allow_reauth=False, allow_retry=allow_retry
+            )
 
-        async with self._session.post(url, json=payload or {}, timeout=self._timeout) as response:
-            body_text = await response.text()
+        encoding = _response_encoding(charset)
+        try:
+            data = _json_loads(body, encoding)
+        except ValueError as err:
             LOGGER.debug(
-                "Response status for %s: %s, headers: %s, body: %s",
+                "Failed to parse JSON for %s, returning raw text. Error: %s",
                 endpoint,
-                response.status,
-                dict(response.headers),
-                body_text,
+                err,
             )
-            if response.status == 401:
-                LOGGER.info("Session expired, retrying login")
-                if not allow_reauth:
-                    raise NormanBlindsAuthError("Authentication failed after retry")
-                await self._login(force=True)
-                return await self._request(endpoint, payload, allow_reauth=False, allow_retry=allow_retry)
-
-            response.raise_for_status()
-            try:
-                data = await response.json(content_type=None)
-            except Exception as err:  # pylint: disable=broad-except
-                LOGGER.debug(
-                    "Failed to parse JSON for %s, returning raw text. Error: %s",
+            data = body.decode(encoding, errors="replace")
+
+        # Some gateway endpoints return {"error": -2} when auth expires without an HTTP 401.
+        if isinstance(data, dict) and "error" in data:
+            error_code = data.get("error")
+            LOGGER.warning("Gateway returned error code %s for %s", error_code, endpoint)
+            if str(error_code) == "-2" and allow_retry:
+                LOGGER.info("Retrying %s after re-login due to gateway error code -2", endpoint)
+                self._note_session_expired(generation)
+                await self._login(stale_generation=generation)
+                self.stats.record_retry(endpoint)
+                return await self._async_post(
                     endpoint,
-                    err,
+                    payload,
+                    allow_reauth=False,
+                    allow_retry=False,
                 )
-                data = body_text
-
-            LOGGER.debug("Received response from %s: %s", endpoint, data)
-
-            # Some gateway endpoints return {"error": -2} when auth expires without an HTTP 401.
-            if isinstance(data, dict) and "error" in data:
-                error_code = data.get("error")
-                LOGGER.warning("Gateway returned error code %s for %s", error_code, endpoint)
-                if str(error_code) == "-2" and allow_retry:
-                    LOGGER.info("Retrying %s after forced login due to gateway error code -2", endpoint)
-                    await self._login(force=True)
-                    return await self._request(
-                        endpoint,
-                        payload,
-                        allow_reauth=False,
-                        allow_retry=False,
-                    )
-                raise NormanBlindsApiError(f"Gateway returned error code {error_code} for {endpoint}")
-            return data
-
-    async def async_get_room_info(self, *, allow_retry: bool = True) -> list[dict[str, Any]]:
-        """Return rooms from the gateway."""
-
-        payload = await self._request(ROOM_INFO_ENDPOINT)
+            self.stats.record_error(endpoint)
+            raise NormanBlindsApiError(f"Gateway returned error code {error_code} for {endpoint}")
+        if generation == self._session_generation:
+            self._session_confirmed = sent
+        return data
+
+    async def async_get_room_info(self) -> list[NormanRoom]:
+        """Return normalized rooms, sharing any in-flight or just-completed fetch."""
+
+        rooms = await self._scheduler.async_single_flight(
+            "rooms", self._async_fetch_room_info, max_age=self.read_freshness
+        )
+        return list(rooms)
+
+    async def async_get_window_info(self) -> list[NormanWindow]:
+        """Return normalized windows, sharing any in-flight or just-completed fetch."""
+
+        windows = await self._scheduler.async_single_flight(
+            "windows", self._async_fetch_window_info, max_age=self.read_freshness
+        )
+        return list(windows)
+
+    async def _async_fetch_room_info(
+        self, *, stale_generation: int | None = None
+    ) -> list[NormanRoom]:
+        """Fetch normalized rooms, retrying once on a new session if the payload is malformed."""
+
+        payload = await self._request(ROOM_INFO_ENDPOINT, stale_generation=stale_generation)
         if isinstance(payload, dict):
             rooms = payload.get("rooms")
         else:
@@ -185,17 +628,20 @@ class NormanBlindsApiClient:
 
         if not isinstance(rooms, list):
             LOGGER.debug("Unexpected room payload: %s", payload)
-            if allow_retry:
-                LOGGER.info("Retrying room fetch after forcing login due to malformed payload")
-                await self._login(force=True)
-                return await self.async_get_room_info(allow_retry=False)
+            if stale_generation is None:
+                LOGGER.info("Retrying room fetch after re-login due to malformed payload")
+                return await self._async_fetch_room_info(
+                    stale_generation=self._session_generation
+                )
             raise NormanBlindsApiError("Malformed room data from gateway")
-        return rooms
+        return [NormanRoom.from_payload(room) for room in rooms if isinstance(room, dict)]
 
-    async def async_get_window_info(self, *, allow_retry: bool = True) -> list[dict[str, Any]]:
-        """Return windows from the gateway."""
+    async def _async_fetch_window_info(
+        self, *, stale_generation: int | None = None
+    ) -> list[NormanWindow]:
+        """Fetch normalized windows, retrying once on a new session if the payload is malformed."""
 
-        payload = await self._request(WINDOW_INFO_ENDPOINT)
+        payload = await self._request(WINDOW_INFO_ENDPOINT, stale_generation=stale_generation)
         if isinstance(payload, dict):
             windows = payload.get("windows")
         else:
@@ -203,54 +649,121 @@ class NormanBlindsApiClient:
 
         if not isinstance(windows, list):
             LOGGER.debug("Unexpected window payload: %s", payload)
-            if allow_retry:
-                LOGGER.info("Retrying window fetch after forcing login due to malformed payload")
-                await self._login(force=True)
-                return await self.async_get_window_info(allow_retry=False)
+            if stale_generation is None:
+                LOGGER.info("Retrying window fetch after re-login due to malformed payload")
+                return await self._async_fetch_window_info(
+                    stale_generation=self._session_generation
+                )
             raise NormanBlindsApiError("Malformed window data from gateway")
-        return windows
+        return [NormanWindow.from_payload(window) for window in windows if isinstance(window, dict)]
 
-    async def async_get_combined_state(self) -> dict[str, Any]:
-        """Return windows merged with their rooms and suggested areas."""
+    @property
+    def room_cache_fresh(self) -> bool:
+        """Return True if the cached room list is still within its TTL."""
+
+        return (
+            self._rooms_cache is not None
+            and time.monotonic() - self._rooms_fetched_at < self.room_cache_ttl
+        )
+
+    def invalidate_room_cache(self) -> None:
+        """Force the next combined state fetch to reload rooms from the hub."""
+
+        self._rooms_cache = None
+        self._unknown_room_ids = set()
+        self._scheduler.expire("rooms", "poll")
+
+    async def _async_refresh_rooms(self) -> list[NormanRoom]:
+        """Fetch rooms from the hub and store them in the topology cache."""
 
         rooms = await self.async_get_room_info()
-        windows = await self.async_get_window_info()
+        self._rooms_cache = rooms
+        self._rooms_fetched_at = time.monotonic()
+        self._unknown_room_ids = set()
+        return rooms
 
-        room_index = {
-            room.get("roomId") or room.get("id") or room.get("Id"): room for room in rooms
-        }
-        combined: list[dict[str, Any]] = []
-
-        for window in windows:
-            room_id = (
-                window.get("roomId")
-                or window.get("room_id")
-                or window.get("room")
-                or window.get("RId")
-            )
-            room = room_index.get(room_id)
-            suggested_area = (
-                room.get("roomName") or room.get("name") or room.get("Name") if room else None
-            )
+    @property
+    def request_metrics(self) -> dict[str, Any]:
+        """Return request scheduler queue-depth and throughput counters."""
 
-            combined.append(
-                {
-                    "window": window,
-                    "room": room,
-                    "room_name": suggested_area,
-                    "suggested_area": suggested_area,
-                }
+        return self._scheduler.metrics
+
+    async def async_get_combined_state(self) -> dict[str, Any]:
+        """Return rooms and windows, with each window's room name resolved.
+
+        Concurrent callers (coordinator polls, follow-up refreshes) share one
+        fetch, and a result younger than ``read_freshness`` seconds is reused
+        instead of polling the hub again.
+        """
+
+        state = await self._scheduler.async_single_flight(
+            "poll", self._async_fetch_combined_state, max_age=self.read_freshness
+        )
+        # Callers annotate the dict they get back; keep the shared one pristine.
+        return dict(state)
+
+    async def _async_fetch_combined_state(self) -> dict[str, Any]:
+        """Fetch rooms and windows from the hub.
+
+        Rooms rarely change, so they are served from a cache for
+        ``room_cache_ttl`` seconds and only reloaded early when a window
+        references a room id the cache has not seen. When both need fetching
+        they are issued concurrently if the scheduler allows more than one
+        request at a time.
+        """
+
+        rooms_from_cache = self.room_cache_fresh
+        if rooms_from_cache:
+            rooms = self._rooms_cache or []
+            windows = await self.async_get_window_info()
+        elif self._scheduler.max_concurrent > 1:
+            await self._scheduler.async_run(PRIORITY_POLL, self._ensure_login)
+            rooms, windows = await asyncio.gather(
+                self._async_refresh_rooms(), self.async_get_window_info()
             )
+        else:
+            rooms = await self._async_refresh_rooms()
+            windows = await self.async_get_window_info()
+
+        unknown = _merge_windows(rooms, windows)
+        if rooms_from_cache and unknown - self._unknown_room_ids:
+            LOGGER.debug("Windows reference unknown rooms %s; reloading room info", unknown)
+            rooms = await self._async_refresh_rooms()
+            unknown = _merge_windows(rooms, windows)
+        # Rooms still missing right after a reload are orphans; don't refetch for them every poll.
+        self._unknown_room_ids |= unknown
+
+        return {"rooms": rooms, "windows": windows}
 
-        return {"rooms": rooms, "windows": combined}
+    def set_room_membership(self, room_members: Mapping[Any, frozenset[Any]]) -> None:
+        """Tell the command queue which windows make up each room."""
+
+        self._commands.set_room_members(room_members)
+
+    async def _async_send_command(self, payload: dict[str, Any], priority: int) -> Any:
+        """POST a RemoteControl command; reads cached from before it are no longer fresh."""
+
+        result = await self._request(REMOTE_CONTROL_ENDPOINT, payload, priority=priority)
+        self._scheduler.expire()
+        return result
 
     async def async_set_window_position(self, window_id: int | str, position: int) -> Any:
-        """Send a position command to a specific blind."""
+        """Send a position command to a specific blind.
+
+        Commands wait for the settle delay and only the latest unsent one per
+        blind is sent; if every blind in a room ends up with the same
+        position, one room command is sent instead. Returns
+        ``COMMAND_SUPERSEDED`` if a different command replaced this one.
+        """
 
         if position not in ALLOWED_POSITIONS:
             raise NormanBlindsApiError(
                 f"Invalid position {position}; supported values: {ALLOWED_POSITIONS}"
             )
+        return await self._commands.async_submit_window(window_id, position)
+
+    async def _async_send_window_position(self, window_id: int | str, position: int) -> Any:
+        """POST a single-window RemoteControl command."""
 
         payload: dict[str, Any] = {
             "type": "window",
@@ -258,15 +771,22 @@ class NormanBlindsApiClient:
             "action": position,
             "model": REMOTE_CONTROL_MODEL,
         }
-        return await self._request(REMOTE_CONTROL_ENDPOINT, payload)
+        return await self._async_send_command(payload, PRIORITY_COMMAND)
 
     async def async_set_room_position(self, room_id: int | str, position: int) -> Any:
-        """Send a position command to all blinds in a room."""
+        """Send a position command to all blinds in a room (latest unsent one wins).
+
+        Returns ``COMMAND_SUPERSEDED`` if a different command replaced this one.
+        """
 
         if position not in ALLOWED_POSITIONS:
             raise NormanBlindsApiError(
                 f"Invalid position {position}; supported values: {ALLOWED_POSITIONS}"
             )
+        return await self._commands.async_submit_room(room_id, position)
+
+    async def _async_send_room_position(self, room_id: int | str, position: int) -> Any:
+        """POST a room-wide ("level") RemoteControl command."""
 
         payload: dict[str, Any] = {
             "type": "level",
@@ -275,24 +795,71 @@ class NormanBlindsApiClient:
             "action": position,
             "model": REMOTE_CONTROL_MODEL,
         }
-        return await self._request(REMOTE_CONTROL_ENDPOINT, payload)
+        return await self._async_send_command(payload, PRIORITY_COMMAND)
 
     async def async_set_room_preset(self, room_id: int | str, preset: str) -> Any:
-        """Send a preset command (view/privacy/favorite) to a room."""
+        """Send a preset command (view/privacy/favorite) to a room (latest unsent one wins).
+
+        Returns ``COMMAND_SUPERSEDED`` if a different command replaced this one.
+        """
 
         command = ROOM_PRESETS.get(preset.lower())
         if command is None:
             raise NormanBlindsApiError(f"Unknown preset '{preset}'. Allowed: {list(ROOM_PRESETS)}")
+        return await self._commands.async_submit_preset(room_id, command)
+
+    async def _async_send_room_preset(self, room_id: int | str, command: str) -> Any:
+        """POST a room preset RemoteControl command."""
 
         payload: dict[str, Any] = {
             "type": command,
             "action": 1,
             "id": room_id,
         }
-        return await self._request(REMOTE_CONTROL_ENDPOINT, payload)
+        return await self._async_send_command(payload, PRIORITY_PRESET)
+
+    def start_recording(self) -> None:
+        """Start recording hub exchanges, discarding any unsaved recording."""
+
+        LOGGER.info("Recording exchanges with %s", self._host)
+        self.cassette = NormanBlindsCassette(self._host)
+
+    def stop_recording(self) -> NormanBlindsCassette | None:
+        """Stop recording and return what was recorded, if anything."""
+
+        cassette, self.cassette = self.cassette, None
+        return cassette
+
+    async def async_close(self) -> None:
+        """Drop queued commands and stop session renewal; called when the entry unloads."""
+
+        self._commands.cancel()
+        for handle in (self._renew_handle, self._probe_handle):
+            if handle is not None:
+                handle.cancel()
+        self._renew_handle = self._probe_handle = None
+        for task in self._background_tasks:
+            task.cancel()
 
     @property
     def gateway_info(self) -> dict[str, Any]:
         """Return cached gateway info from login."""
 
         return self._gateway_info
+
+
+def _merge_windows(rooms: list[NormanRoom], windows: list[NormanWindow]) -> set[Any]:
+    """Resolve each window's room name; return room ids missing from ``rooms``.
+
+    Windows in a room the list does not have keep the ``roomName`` from
+    their own payload.
+    """
+
+    room_names = {room.id: room.name for room in rooms}
+    unknown: set[Any] = set()
+    for window in windows:
+        if window.room_id in room_names:
+            window.room_name = room_names[window.room_id]
+        elif window.room_id is not None:
+            unknown.add(window.room_id)
+    return unknown
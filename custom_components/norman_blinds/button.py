@@ -1,16 +1,19 @@
 """Button platform for Norman Blinds room presets."""
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .command_queue import COMMAND_SUPERSEDED
 from .const import DOMAIN
-from .coordinator import NormanBlindsDataUpdateCoordinator
+from .coordinator import NormanBlindsDataUpdateCoordinator, room_context
+from .models import NormanRoom
 
 PRESET_BUTTONS: list[ButtonEntityDescription] = [
     ButtonEntityDescription(key="view", translation_key="view"),
@@ -27,68 +30,38 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator: NormanBlindsDataUpdateCoordinator = data["coordinator"]
 
-    entities: list[ButtonEntity] = []
+    def _resolve_room(room_id: Any) -> NormanRoom:
+        # Prefer the explicit room list; fall back to the room implied by window payloads.
+        if (room := coordinator.get_room(room_id)) is not None:
+            return room
+        members = coordinator.get_room_windows(room_id)
+        return NormanRoom(room_id, members[0].room_name if members else None)
 
-    def _build_entities() -> list[ButtonEntity]:
+    def _build_entities(rooms: Iterable[NormanRoom]) -> list[ButtonEntity]:
         local_entities: list[ButtonEntity] = []
-
-        # Prefer explicit room list; fall back to deriving rooms from window payloads.
-        rooms = coordinator.data.get("rooms") or []
-        if not rooms:
-            # Derive unique rooms from windows.
-            seen: dict[Any, dict[str, Any]] = {}
-            for item in coordinator.data.get("windows", []):
-                window = item.get("window") or {}
-                rid = (
-                    window.get("roomId")
-                    or window.get("room_id")
-                    or window.get("room")
-                    or window.get("RId")
-                )
-                if rid is None or rid in seen:
-                    continue
-                seen[rid] = {
-                    "Id": rid,
-                    "Name": item.get("suggested_area") or window.get("roomName"),
-                }
-            rooms = list(seen.values())
-
         for room in rooms:
-            room_id = room.get("Id") or room.get("id") or room.get("roomId")
-            room_name = room.get("Name") or room.get("name") or room.get("roomName")
             for desc in PRESET_BUTTONS:
                 local_entities.append(
                     NormanBlindsRoomPresetButton(
                         coordinator=coordinator,
-                        room_id=room_id,
-                        room_name=room_name,
+                        room_id=room.id,
+                        room_name=room.name,
                         description=desc,
                     )
                 )
         return local_entities
 
-    entities.extend(_build_entities())
-    async_add_entities(entities)
-
-    seen_ids: set[str] = {entity.unique_id for entity in entities if entity.unique_id}
-
-    async def _async_add_new_entities() -> None:
-        new_entities = _build_entities()
-        to_add = [
-            entity
-            for entity in new_entities
-            if entity.unique_id and entity.unique_id not in seen_ids
-        ]
-        if not to_add:
-            return
+    rooms = coordinator.data.get("rooms") or [
+        _resolve_room(room_id) for room_id in coordinator.data.get("room_ids", ())
+    ]
+    async_add_entities(_build_entities(rooms))
 
-        seen_ids.update(entity.unique_id for entity in to_add if entity.unique_id)
-        async_add_entities(to_add)
+    @callback
+    def _async_add_new_entities(window_ids: set[Any], room_ids: set[Any]) -> None:
+        if to_add := _build_entities(_resolve_room(room_id) for room_id in room_ids):
+            async_add_entities(to_add)
 
-    def _handle_coordinator_update() -> None:
-        coordinator.hass.async_create_task(_async_add_new_entities())
-
-    coordinator.async_add_listener(_handle_coordinator_update)
+    entry.async_on_unload(coordinator.async_add_topology_listener(_async_add_new_entities))
 
 
 class NormanBlindsRoomPresetButton(
@@ -105,7 +78,8 @@ class NormanBlindsRoomPresetButton(
         room_name: str | None,
         description: ButtonEntityDescription,
     ) -> None:
-        super().__init__(coordinator)
+        # Availability only depends on the room existing, not on blind positions.
+        super().__init__(coordinator, room_context(room_id, ("present",)))
         self.entity_description = description
         self._room_id = room_id
         self._room_name = room_name or "Room"
@@ -128,23 +102,7 @@ class NormanBlindsRoomPresetButton(
     def available(self) -> bool:
         """Combine coordinator availability with presence of the room."""
 
-        rooms = self.coordinator.data.get("rooms") or []
-        room_present = any(
-            (room.get("Id") or room.get("id") or room.get("roomId")) == self._room_id
-            for room in rooms
-        )
-        if not room_present:
-            for item in self.coordinator.data.get("windows", []):
-                window = item.get("window") or {}
-                rid = (
-                    window.get("roomId")
-                    or window.get("room_id")
-                    or window.get("room")
-                    or window.get("RId")
-                )
-                if rid == self._room_id:
-                    room_present = True
-                    break
+        room_present = self.coordinator.has_room(self._room_id)
         return room_present and bool(self.coordinator.last_update_success)
 
     async def async_press(self, **kwargs: Any) -> None:
@@ -152,6 +110,11 @@ class NormanBlindsRoomPresetButton(
 
         if self._room_id is None:
             return
-        await self.coordinator.api.async_set_room_preset(
+        result = await self.coordinator.api.async_set_room_preset(
             self._room_id, self.entity_description.key
         )
+        if result is COMMAND_SUPERSEDED:
+            return
+        self.coordinator.async_track_command(
+            {window.id: None for window in self.coordinator.get_room_windows(self._room_id)}
+        )
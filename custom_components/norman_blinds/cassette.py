@@ -0,0 +1,131 @@
+"""Recording of hub exchanges for offline replay."""
+from __future__ import annotations
+
+import base64
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+from .const import CASSETTE_MAX_EXCHANGES, LOGGER
+
+CASSETTE_VERSION = 2
+
+_REDACTED = "**REDACTED**"
+
+
+class NormanBlindsCassette:
+    """Hub exchanges in the order they completed.
+
+    Each exchange keeps the endpoint, the request payload (password
+    redacted), the HTTP status, the response ``Content-Type``, the raw
+    response body and how long the hub took to answer, plus its offset
+    from the start of the recording. Bodies are stored verbatim (base64
+    encoded, read them back with ``exchange_body``) so odd payloads and
+    charsets replay exactly as the hub sent them. Recording stops adding
+    exchanges once ``max_exchanges`` is reached.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        exchanges: list[dict[str, Any]] | None = None,
+        *,
+        recorded_at: str | None = None,
+        max_exchanges: int = CASSETTE_MAX_EXCHANGES,
+    ) -> None:
+        self.host = host
+        self.exchanges: list[dict[str, Any]] = exchanges if exchanges is not None else []
+        self.recorded_at = recorded_at or datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.max_exchanges = max_exchanges
+        self._started = time.monotonic()
+
+    @property
+    def full(self) -> bool:
+        """Return True once no more exchanges will be recorded."""
+
+        return len(self.exchanges) >= self.max_exchanges
+
+    def record(
+        self,
+        endpoint: str,
+        payload: Any,
+        status: int,
+        body: bytes,
+        elapsed: float,
+        *,
+        content_type: str | None = None,
+    ) -> None:
+        """Append one completed exchange."""
+
+        if self.full:
+            return
+        if isinstance(payload, dict) and "password" in payload:
+            payload = {**payload, "password": _REDACTED}
+        self.exchanges.append(
+            {
+                "t": round(time.monotonic() - self._started, 3),
+                "endpoint": endpoint.rsplit("/", 1)[-1],
+                "payload": payload,
+                "status": status,
+                "elapsed": round(elapsed, 4),
+                "content_type": content_type,
+                "body": base64.b64encode(body).decode("ascii"),
+            }
+        )
+        if self.full:
+            LOGGER.warning(
+                "Recording for %s reached %s exchanges; later requests are not recorded",
+                self.host,
+                self.max_exchanges,
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cassette as JSON-serialisable data."""
+
+        return {
+            "version": CASSETTE_VERSION,
+            "host": self.host,
+            "recorded_at": self.recorded_at,
+            "exchanges": self.exchanges,
+        }
+
+    @staticmethod
+    def exchange_body(exchange: dict[str, Any]) -> bytes:
+        """Return the response body of a recorded exchange as the hub sent it."""
+
+        return base64.b64decode(exchange["body"])
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> NormanBlindsCassette:
+        """Rebuild a cassette from ``as_dict`` output."""
+
+        version = data.get("version")
+        exchanges = list(data.get("exchanges") or [])
+        if version == 1:
+            # Version 1 kept bodies as text already decoded as UTF-8, without the content type.
+            exchanges = [
+                {
+                    **exchange,
+                    "content_type": None,
+                    "body": base64.b64encode(exchange["body"].encode()).decode("ascii"),
+                }
+                for exchange in exchanges
+            ]
+        elif version != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version {version!r}")
+        return cls(data.get("host", ""), exchanges, recorded_at=data.get("recorded_at"))
+
+    def save(self, path: str | Path) -> None:
+        """Write the cassette to ``path``; blocking, run it in the executor."""
+
+        Path(path).write_text(
+            json.dumps(self.as_dict(), separators=(",", ":")), encoding="utf-8"
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> NormanBlindsCassette:
+        """Read a cassette written by ``save``."""
+
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
@@ -0,0 +1,103 @@
+"""Circuit breaker for an unreachable gateway."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+from typing import Any
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_INITIAL_BACKOFF,
+    BREAKER_MAX_BACKOFF,
+    LOGGER,
+)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class NormanBlindsCircuitBreaker:
+    """Track hub reachability so requests fail fast while it is down.
+
+    After ``BREAKER_FAILURE_THRESHOLD`` consecutive connection failures the
+    breaker opens and requests are refused without touching the network.
+    The owner sends one probe when the backoff has elapsed (``retry_at``);
+    a successful probe closes the breaker, a failed one reopens it with the
+    backoff doubled up to ``BREAKER_MAX_BACKOFF``.
+    """
+
+    def __init__(self) -> None:
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.backoff: float = BREAKER_INITIAL_BACKOFF
+        self.opened_at: float | None = None
+        self.retry_at: float | None = None
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def allows_requests(self) -> bool:
+        """Return True unless the breaker is refusing requests."""
+
+        return self.state == STATE_CLOSED
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return breaker state for diagnostics and entity attributes."""
+
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "backoff": self.backoff if self.state != STATE_CLOSED else None,
+            "retry_in": (
+                max(0.0, round(self.retry_at - time.monotonic(), 1))
+                if self.retry_at is not None
+                else None
+            ),
+        }
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call ``listener`` on every state change; returns an unsubscribe callback."""
+
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def record_success(self) -> None:
+        """Note that the hub answered; close the breaker if it was tripped."""
+
+        self.consecutive_failures = 0
+        if self.state != STATE_CLOSED:
+            LOGGER.info("Norman hub is reachable again")
+            self.backoff = BREAKER_INITIAL_BACKOFF
+            self.opened_at = self.retry_at = None
+            self._set_state(STATE_CLOSED)
+
+    def record_failure(self) -> None:
+        """Note a connection failure; open the breaker at the threshold."""
+
+        self.consecutive_failures += 1
+        if self.state == STATE_HALF_OPEN:
+            self.backoff = min(self.backoff * 2, BREAKER_MAX_BACKOFF)
+        elif self.state == STATE_CLOSED and self.consecutive_failures >= BREAKER_FAILURE_THRESHOLD:
+            LOGGER.warning(
+                "Norman hub unreachable after %s attempts; failing requests fast",
+                self.consecutive_failures,
+            )
+        else:
+            return
+        self.opened_at = time.monotonic()
+        self.retry_at = self.opened_at + self.backoff
+        self._set_state(STATE_OPEN)
+
+    def start_probe(self) -> None:
+        """Mark the single half-open probe as in flight."""
+
+        self.retry_at = None
+        self._set_state(STATE_HALF_OPEN)
+
+    def _set_state(self, state: str) -> None:
+        """Update the state and notify listeners."""
+
+        self.state = state
+        for listener in list(self._listeners):
+            listener()
@@ -0,0 +1,211 @@
+"""Queueing of blind commands before they reach the gateway."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from .const import LOGGER
+
+SendCommand = Callable[[Any, Any], Awaitable[Any]]
+
+KIND_WINDOW = "window"
+KIND_ROOM = "room"
+KIND_PRESET = "preset"
+
+# Result for callers whose command was replaced by a different one before it was sent.
+COMMAND_SUPERSEDED: Any = object()
+
+
+class _QueuedCommand:
+    """A command waiting to be sent, plus every caller waiting on it."""
+
+    __slots__ = ("kind", "target_id", "value", "futures")
+
+    def __init__(self, kind: str, target_id: Any, value: Any) -> None:
+        self.kind = kind
+        self.target_id = target_id
+        self.value = value
+        self.futures: list[asyncio.Future[Any]] = []
+
+
+class NormanBlindsCommandQueue:
+    """Hold blind commands for a settle delay, keeping only the latest per target.
+
+    Commands are keyed by window or room. A newer command for a key that
+    has not been sent yet replaces the queued one, and a room command or
+    preset replaces queued commands for that room's windows. Callers whose
+    command was replaced by a different one receive ``COMMAND_SUPERSEDED``
+    straight away, so they can skip optimistic state for a position that
+    was never sent; a replacement carrying the same position keeps them
+    waiting for its result.
+
+    When a batch is sent, rooms whose members (two or more blinds) are all
+    targeted with the same position get a single room ("level") command
+    instead of one RemoteControl POST per blind. Batches are sent one at a
+    time, and commands arriving meanwhile collapse into the next batch.
+    """
+
+    def __init__(
+        self,
+        send_window: SendCommand,
+        send_room: SendCommand,
+        send_preset: SendCommand,
+        *,
+        settle_delay: float,
+    ) -> None:
+        self._senders: dict[str, SendCommand] = {
+            KIND_WINDOW: send_window,
+            KIND_ROOM: send_room,
+            KIND_PRESET: send_preset,
+        }
+        self.settle_delay = settle_delay
+        self._room_members: dict[Any, frozenset[Any]] = {}
+        self._pending: dict[tuple[str, Any], _QueuedCommand] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def pending_count(self) -> int:
+        """Return the number of commands waiting to be sent."""
+
+        return len(self._pending)
+
+    def set_room_members(self, room_members: Mapping[Any, frozenset[Any]]) -> None:
+        """Replace the room membership used for superseding and coalescing."""
+
+        self._room_members = dict(room_members)
+
+    async def async_submit_window(self, window_id: Any, position: int) -> Any:
+        """Queue a window position, replacing any unsent one for that window."""
+
+        return await self._async_submit(KIND_WINDOW, window_id, position)
+
+    async def async_submit_room(self, room_id: Any, position: int) -> Any:
+        """Queue a room position, replacing unsent commands for the room and its windows."""
+
+        return await self._async_submit(KIND_ROOM, room_id, position)
+
+    async def async_submit_preset(self, room_id: Any, preset: str) -> Any:
+        """Queue a room preset, replacing unsent commands for the room and its windows."""
+
+        return await self._async_submit(KIND_PRESET, room_id, preset)
+
+    async def _async_submit(self, kind: str, target_id: Any, value: Any) -> Any:
+        """Queue a command and wait for the command that ends up carrying it."""
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        key = (KIND_WINDOW if kind == KIND_WINDOW else KIND_ROOM, target_id)
+
+        command = self._pending.pop(key, None)
+        if command is None:
+            command = _QueuedCommand(kind, target_id, value)
+        elif command.kind != kind or command.value != value:
+            LOGGER.debug("Replacing unsent %s command for %s with %s", kind, target_id, value)
+            _resolve_superseded(command.futures)
+            command.futures = []
+            command.kind = kind
+            command.value = value
+        command.futures.append(future)
+
+        if kind != KIND_WINDOW:
+            for window_id in self._room_members.get(target_id, ()):
+                if (superseded := self._pending.pop((KIND_WINDOW, window_id), None)) is None:
+                    continue
+                if kind == KIND_ROOM and superseded.value == value:
+                    command.futures.extend(superseded.futures)
+                else:
+                    _resolve_superseded(superseded.futures)
+
+        # Re-insert so send order follows the latest submission.
+        self._pending[key] = command
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.settle_delay, self._start_flush)
+        return await future
+
+    def _start_flush(self) -> None:
+        """Timer callback: send the queue once any in-flight batch finishes."""
+
+        self._flush_handle = None
+        task = asyncio.get_running_loop().create_task(self._async_flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _async_flush(self) -> None:
+        """Send the queued commands, coalescing fully-covered rooms."""
+
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch = list(self._pending.values())
+            self._pending = {}
+
+            for command in self._coalesce(batch):
+                try:
+                    result = await self._senders[command.kind](command.target_id, command.value)
+                except Exception as err:  # pylint: disable=broad-except
+                    for future in command.futures:
+                        if not future.done():
+                            future.set_exception(err)
+                else:
+                    for future in command.futures:
+                        if not future.done():
+                            future.set_result(result)
+
+    def _coalesce(self, batch: list[_QueuedCommand]) -> list[_QueuedCommand]:
+        """Replace same-position window commands covering a whole room with one room command."""
+
+        windows = {
+            command.target_id: command for command in batch if command.kind == KIND_WINDOW
+        }
+        room_for_window: dict[Any, _QueuedCommand] = {}
+        for room_id, members in self._room_members.items():
+            if len(members) < 2 or not members <= windows.keys():
+                continue
+            positions = {windows[window_id].value for window_id in members}
+            if len(positions) != 1:
+                continue
+            LOGGER.debug(
+                "Coalescing %s window commands into one command for room %s",
+                len(members),
+                room_id,
+            )
+            room_command = _QueuedCommand(KIND_ROOM, room_id, positions.pop())
+            for window_id in members:
+                room_command.futures.extend(windows[window_id].futures)
+                room_for_window[window_id] = room_command
+
+        if not room_for_window:
+            return batch
+
+        commands: list[_QueuedCommand] = []
+        for command in batch:
+            if command.kind == KIND_WINDOW and command.target_id in room_for_window:
+                room_command = room_for_window[command.target_id]
+                if room_command not in commands:
+                    commands.append(room_command)
+                continue
+            commands.append(command)
+        return commands
+
+    def cancel(self) -> None:
+        """Cancel the pending flush and fail any queued commands."""
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for command in self._pending.values():
+            for future in command.futures:
+                if not future.done():
+                    future.cancel()
+        self._pending = {}
+
+
+def _resolve_superseded(futures: list[asyncio.Future[Any]]) -> None:
+    """Tell waiting callers their command was replaced before it was sent."""
+
+    for future in futures:
+        if not future.done():
+            future.set_result(COMMAND_SUPERSEDED)
@@ -0,0 +1,134 @@
+"""Follow-up polling until commanded blinds reach their targets."""
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from datetime import datetime
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    COMMAND_CONVERGENCE_TIMEOUT,
+    DEFAULT_REFRESH_DELAY,
+    LOGGER,
+    MAX_FOLLOW_UP_DELAY,
+)
+from .models import NormanWindow
+
+
+class _PendingTarget:
+    """A window waiting to report a commanded position."""
+
+    __slots__ = ("target", "deadline", "last_position")
+
+    def __init__(self, target: int | None, deadline: float, last_position: int | None) -> None:
+        self.target = target
+        self.deadline = deadline
+        self.last_position = last_position
+
+
+class NormanBlindsCommandTracker:
+    """Track commanded positions and poll until every window converges.
+
+    Commands issued close together share one debounced follow-up poll.
+    After every coordinator refresh, whether it was a follow-up or a
+    regular poll, windows that report their target (or time out) are
+    dropped; if any remain, the follow-up is pushed back by a doubling
+    delay, so it never lands right after a regular poll. Follow-ups go
+    through the coordinator's debounced refresh request, which keeps the
+    minimum gap between polls.
+    A target of ``None`` (e.g. a room preset) converges once the window's
+    position stops changing between two polls.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        get_window: Callable[[Any], NormanWindow | None],
+        refresh: Callable[[], Coroutine[Any, Any, None]],
+    ) -> None:
+        self._hass = hass
+        self._get_window = get_window
+        self._refresh = refresh
+        self._pending: dict[Any, _PendingTarget] = {}
+        self._delay = DEFAULT_REFRESH_DELAY
+        self._unsub_poll: CALLBACK_TYPE | None = None
+
+    @property
+    def pending(self) -> dict[Any, int | None]:
+        """Return the windows still waiting to converge and their targets."""
+
+        return {window_id: entry.target for window_id, entry in self._pending.items()}
+
+    @callback
+    def async_track(self, targets: dict[Any, int | None]) -> None:
+        """Record commanded targets and (re)start the debounced follow-up poll."""
+
+        deadline = time.monotonic() + COMMAND_CONVERGENCE_TIMEOUT
+        for window_id, target in targets.items():
+            window = self._get_window(window_id)
+            self._pending[window_id] = _PendingTarget(
+                target, deadline, window.position if window else None
+            )
+        if self._pending:
+            self._delay = DEFAULT_REFRESH_DELAY
+            self._schedule(self._delay)
+
+    @callback
+    def async_check(self) -> None:
+        """Drop converged or expired windows; keep polling for the rest."""
+
+        if not self._pending:
+            return
+
+        now = time.monotonic()
+        for window_id, entry in list(self._pending.items()):
+            window = self._get_window(window_id)
+            position = window.position if window else None
+            if entry.target is None:
+                converged = position == entry.last_position
+                entry.last_position = position
+            else:
+                converged = position == entry.target
+            if converged or now >= entry.deadline:
+                if not converged:
+                    LOGGER.debug(
+                        "Window %s did not reach %s within %ss (last %s)",
+                        window_id,
+                        entry.target,
+                        COMMAND_CONVERGENCE_TIMEOUT,
+                        position,
+                    )
+                del self._pending[window_id]
+
+        if self._pending:
+            self._delay = min(self._delay * 2, MAX_FOLLOW_UP_DELAY)
+            self._schedule(self._delay)
+        elif self._unsub_poll is not None:
+            self._unsub_poll()
+            self._unsub_poll = None
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop tracking and cancel any scheduled follow-up poll."""
+
+        self._pending.clear()
+        if self._unsub_poll is not None:
+            self._unsub_poll()
+            self._unsub_poll = None
+
+    @callback
+    def _schedule(self, delay: float) -> None:
+        """Schedule the next follow-up poll, replacing any pending one."""
+
+        if self._unsub_poll is not None:
+            self._unsub_poll()
+        self._unsub_poll = async_call_later(self._hass, delay, self._async_poll)
+
+    async def _async_poll(self, _now: datetime) -> None:
+        """Run a follow-up poll; the coordinator update calls async_check."""
+
+        self._unsub_poll = None
+        await self._refresh()
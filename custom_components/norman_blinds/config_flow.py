@@ -5,6 +5,7 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PASSWORD
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
@@ -12,7 +13,21 @@ from aiohttp import ClientError
 import asyncio
 
 from .api import NormanBlindsApiClient, NormanBlindsApiError, NormanBlindsAuthError
-from .const import DEFAULT_PASSWORD, DOMAIN
+from .const import (
+    CONF_COMMAND_SETTLE_DELAY,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_ROOM_CACHE_TTL,
+    DEFAULT_COMMAND_SETTLE_DELAY,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_PASSWORD,
+    DEFAULT_ROOM_CACHE_TTL,
+    DOMAIN,
+    MIN_POLL_GAP,
+)
 
 DATA_SCHEMA = vol.Schema(
     {
@@ -27,6 +42,15 @@ class NormanBlindsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow handler."""
+
+        return NormanBlindsOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input: dict | None = None) -> FlowResult:
         """Handle the initial step."""
 
@@ -63,3 +87,45 @@ class NormanBlindsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=DATA_SCHEMA,
             errors=errors,
         )
+
+
+class NormanBlindsOptionsFlow(config_entries.OptionsFlow):
+    """Handle tuning options for how the integration talks to the hub."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input: dict | None = None) -> FlowResult:
+        """Manage the options."""
+
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_MAX_CONCURRENT_REQUESTS,
+                    default=options.get(
+                        CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=4)),
+                vol.Required(
+                    CONF_ROOM_CACHE_TTL,
+                    default=options.get(CONF_ROOM_CACHE_TTL, DEFAULT_ROOM_CACHE_TTL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_FAST_SCAN_INTERVAL,
+                    default=options.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=MIN_POLL_GAP)),
+                vol.Required(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=MIN_POLL_GAP)),
+                vol.Required(
+                    CONF_COMMAND_SETTLE_DELAY,
+                    default=options.get(CONF_COMMAND_SETTLE_DELAY, DEFAULT_COMMAND_SETTLE_DELAY),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
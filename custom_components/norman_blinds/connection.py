@@ -0,0 +1,63 @@
+"""Per-hub HTTP connection pool."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, CookieJar, TCPConnector, TraceConfig
+
+from .const import CONNECTION_KEEPALIVE, DNS_CACHE_TTL
+
+
+class NormanBlindsHubConnection:
+    """Own a client session whose connector only ever talks to one hub.
+
+    The shared Home Assistant session is tuned for many hosts; the hub is
+    a single embedded HTTP server usually addressed by an mDNS name. This
+    pool keeps at most ``max_connections`` sockets to it, reuses them
+    while the hub allows keep-alive, and caches the resolved address for
+    ``DNS_CACHE_TTL`` seconds so new connections skip the mDNS lookup.
+    The cookie jar accepts cookies from bare IP addresses, which the
+    shared session's jar drops.
+    """
+
+    def __init__(self, *, max_connections: int = 1) -> None:
+        self._counters = dict.fromkeys(
+            ("connections_created", "connections_reused", "dns_cache_hits", "dns_cache_misses"), 0
+        )
+        trace = TraceConfig()
+        trace.on_connection_create_end.append(self._counter("connections_created"))
+        trace.on_connection_reuseconn.append(self._counter("connections_reused"))
+        trace.on_dns_cache_hit.append(self._counter("dns_cache_hits"))
+        trace.on_dns_cache_miss.append(self._counter("dns_cache_misses"))
+        self.session = ClientSession(
+            connector=TCPConnector(
+                limit=max_connections,
+                limit_per_host=max_connections,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=CONNECTION_KEEPALIVE,
+            ),
+            cookie_jar=CookieJar(unsafe=True),
+            trace_configs=[trace],
+        )
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return connection reuse and address cache counters."""
+
+        return dict(self._counters)
+
+    def _counter(self, name: str) -> Any:
+        """Return a trace callback that increments counter ``name``."""
+
+        async def _increment(
+            session: ClientSession, context: SimpleNamespace, params: Any
+        ) -> None:
+            self._counters[name] += 1
+
+        return _increment
+
+    async def async_close(self) -> None:
+        """Close the session and every pooled connection."""
+
+        await self.session.close()
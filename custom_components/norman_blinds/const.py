@@ -9,8 +9,43 @@ DOMAIN = "norman_blinds"
 LOGGER = logging.getLogger(__package__)
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
-DEFAULT_REQUEST_TIMEOUT = 10
+DEFAULT_REQUEST_TIMEOUT = 10  # seconds; used until an endpoint has enough latency samples
+REQUEST_TIMEOUT_FLOOR = 1  # seconds; adaptive timeouts never go below this
+REQUEST_TIMEOUT_CEILING = 30  # seconds; adaptive timeouts never go above this
+REQUEST_TIMEOUT_P99_MULTIPLIER = 3  # adaptive timeout is this multiple of the endpoint's p99
+LATENCY_SAMPLES = 100  # recent requests per endpoint used for the latency distribution
+LATENCY_MIN_SAMPLES = 10  # samples needed before an endpoint gets an adaptive timeout
+LATENCY_HISTOGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)  # seconds; upper bucket bounds
+CASSETTE_MAX_EXCHANGES = 5000  # exchanges kept per recording before recording stops
 DEFAULT_REFRESH_DELAY = 5  # seconds delay before requesting refresh after a command
+MIN_POLL_GAP = 2  # seconds; never poll the hub more often than this
+FAST_POLLS_AFTER_COMMAND = 3  # polls kept at the fast interval after a command
+COMMAND_CONVERGENCE_TIMEOUT = 60  # seconds to wait for blinds to report a commanded position
+MAX_FOLLOW_UP_DELAY = 20  # seconds; ceiling for the follow-up poll backoff
+DEFAULT_READ_FRESHNESS = 0.5  # seconds a completed read is reused by later callers
+SESSION_RENEW_MARGIN = 15  # seconds before the learned session lifetime to log in again
+SESSION_RENEW_RETRY = 5  # seconds to wait before retrying a renewal deferred by pending commands
+SESSION_LIFETIME_SAMPLES = 5  # observed expirations kept to estimate the session lifetime
+SESSION_MIN_LIFETIME = 60  # seconds; earlier expirations (e.g. a hub reboot) are not learned
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60  # seconds; snapshot writes are batched rather than done every poll
+DNS_CACHE_TTL = 300  # seconds resolved hub addresses (often slow mDNS lookups) are reused
+CONNECTION_KEEPALIVE = 10  # seconds an idle connection to the hub is kept open for reuse
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive connection failures before requests fail fast
+BREAKER_INITIAL_BACKOFF = 5  # seconds before the first probe of an unreachable hub
+BREAKER_MAX_BACKOFF = 300  # seconds; ceiling for the probe backoff
+
+# Options
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 1  # the embedded CGI server is safest one request at a time
+CONF_ROOM_CACHE_TTL = "room_cache_ttl"
+DEFAULT_ROOM_CACHE_TTL = 3600  # seconds; rooms are refetched early if a window names an unknown one
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+DEFAULT_FAST_SCAN_INTERVAL = 5  # seconds; used while blinds are moving
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+DEFAULT_MAX_SCAN_INTERVAL = 300  # seconds; idle polling backs off to this ceiling
+CONF_COMMAND_SETTLE_DELAY = "command_settle_delay"
+DEFAULT_COMMAND_SETTLE_DELAY = 0.2  # seconds a command waits so newer ones can replace or coalesce it
 
 DEFAULT_APP_VERSION = "2.11.21"
 DEFAULT_PASSWORD = "123456789"
@@ -20,6 +55,10 @@ ROOM_INFO_ENDPOINT = "/cgi-bin/cgi/getRoomInfo"
 WINDOW_INFO_ENDPOINT = "/cgi-bin/cgi/getWindowInfo"
 REMOTE_CONTROL_ENDPOINT = "/cgi-bin/cgi/RemoteControl"
 
+SERVICE_REFRESH_TOPOLOGY = "refresh_topology"
+SERVICE_START_RECORDING = "start_recording"
+SERVICE_STOP_RECORDING = "stop_recording"
+
 REMOTE_CONTROL_MODEL = 1
 ROOM_REMOTE_CONTROL_LID = 9
 ALLOWED_POSITIONS: tuple[int, ...] = (100, 81, 65, 50, 37, 25, 12, 0)
@@ -1,26 +1,204 @@
 """Coordinator for Norman Blinds."""
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
+from datetime import timedelta
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import NormanBlindsApiClient, NormanBlindsApiError, NormanBlindsAuthError
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL, LOGGER
+from .circuit_breaker import STATE_CLOSED
+from .command_tracker import NormanBlindsCommandTracker
+from .const import (
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    FAST_POLLS_AFTER_COMMAND,
+    LOGGER,
+    MIN_POLL_GAP,
+    SNAPSHOT_SAVE_DELAY,
+)
+from .models import NormanRoom, NormanRoomAggregate, NormanWindow
+
+
+def build_snapshot_index(data: dict[str, Any]) -> dict[str, Any]:
+    """Return id-keyed lookups for a combined gateway state.
+
+    Built once per refresh so entities can resolve their window or room in
+    O(1) instead of scanning the full window list on every state read.
+    """
+
+    rooms_by_id: dict[Any, NormanRoom] = {
+        room.id: room for room in data.get("rooms", []) if room.id is not None
+    }
+    windows_by_id: dict[Any, NormanWindow] = {}
+    windows_by_room: dict[Any, list[NormanWindow]] = {}
+    for window in data.get("windows", []):
+        if window.id is not None:
+            windows_by_id[window.id] = window
+        if window.room_id is not None:
+            windows_by_room.setdefault(window.room_id, []).append(window)
+
+    room_aggregates = {
+        room_id: NormanRoomAggregate.from_windows(
+            room_id, windows_by_room.get(room_id, []), listed=room_id in rooms_by_id
+        )
+        for room_id in rooms_by_id.keys() | windows_by_room.keys()
+    }
+
+    # Rooms come from getRoomInfo; fall back to rooms implied by window membership.
+    room_ids = frozenset(rooms_by_id) or frozenset(windows_by_room)
+    return {
+        "rooms_by_id": rooms_by_id,
+        "windows_by_id": windows_by_id,
+        "windows_by_room": windows_by_room,
+        "room_aggregates": room_aggregates,
+        "room_ids": room_ids,
+        "topology_version": hash((frozenset(windows_by_id), room_ids)),
+    }
+
+
+TOPOLOGY_CONTEXT: tuple[Any, ...] = ("topology", None, None)
+
+
+def window_context(window_id: Any, fields: Iterable[str] | None = None) -> tuple[Any, ...]:
+    """Return a listener context that only fires when a window changes.
+
+    When ``fields`` is given, the listener is only woken if one of those
+    ``NormanWindow`` fields changed (or the window appeared/disappeared).
+    """
+
+    return ("window", window_id, frozenset(fields) if fields else None)
+
+
+def room_context(room_id: Any, fields: Iterable[str] | None = None) -> tuple[Any, ...]:
+    """Return a listener context that only fires when a room changes.
+
+    Room changes are reported as the changed ``NormanRoomAggregate`` fields
+    plus ``room`` when the room record itself changed.
+    """
+
+    return ("room", room_id, frozenset(fields) if fields else None)
+
+
+def diff_snapshots(
+    previous: dict[str, Any] | None, current: dict[str, Any]
+) -> dict[str, dict[Any, frozenset[str] | None]]:
+    """Return per-window and per-room changes between two indexed snapshots.
+
+    A value of ``None`` means the whole record changed (it appeared or
+    disappeared); otherwise it is the set of changed fields.
+    """
+
+    windows: dict[Any, frozenset[str] | None] = {}
+    rooms: dict[Any, frozenset[str] | None] = {}
+    previous_windows = (previous or {}).get("windows_by_id", {})
+    current_windows = current.get("windows_by_id", {})
+
+    for window_id, window in current_windows.items():
+        old_window = previous_windows.get(window_id)
+        if old_window is None:
+            windows[window_id] = None
+        elif changed := window.diff(old_window):
+            windows[window_id] = changed
+
+    for window_id in previous_windows.keys() - current_windows.keys():
+        windows[window_id] = None
+
+    previous_aggregates = (previous or {}).get("room_aggregates", {})
+    current_aggregates = current.get("room_aggregates", {})
+    previous_rooms = (previous or {}).get("rooms_by_id", {})
+    current_rooms = current.get("rooms_by_id", {})
+    for room_id in previous_aggregates.keys() | current_aggregates.keys():
+        old_aggregate = previous_aggregates.get(room_id)
+        aggregate = current_aggregates.get(room_id)
+        if old_aggregate is None or aggregate is None:
+            rooms[room_id] = None
+            continue
+        changed = aggregate.diff(old_aggregate)
+        if previous_rooms.get(room_id) != current_rooms.get(room_id):
+            changed |= {"room"}
+        if changed:
+            rooms[room_id] = changed
+
+    topology_changed = (previous or {}).get("topology_version") != current.get("topology_version")
+    return {
+        "window": windows,
+        "room": rooms,
+        "topology": {None: None} if topology_changed else {},
+    }
+
+
+def _context_changed(
+    context: Any, changes: dict[str, dict[Any, frozenset[str] | None]]
+) -> bool:
+    """Return True if a listener context is affected by a set of changes."""
+
+    if not (isinstance(context, tuple) and len(context) == 3 and context[0] in changes):
+        return True
+    kind, key, fields = context
+    kind_changes = changes[kind]
+    if key not in kind_changes:
+        return False
+    changed_fields = kind_changes[key]
+    return fields is None or changed_fields is None or not fields.isdisjoint(changed_fields)
 
 
 class NormanBlindsDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Manage fetching data from the Norman gateway."""
+    """Manage fetching data from the Norman gateway.
+
+    The poll interval adapts: it drops to ``fast_interval`` after a command
+    or while positions are changing, then doubles on every quiet poll up to
+    ``max_interval``. Polls are never closer together than ``MIN_POLL_GAP``.
+    A failed poll resets the interval to the base scan interval rather than
+    backing off, and a refresh is requested as soon as the API client's
+    circuit breaker closes again.
+
+    With a ``store``, the last good snapshot and the hub session are saved
+    so a restart can create entities before the hub answers; until the
+    first real refresh, ``data_is_cached`` is True.
+    """
 
-    def __init__(self, hass: HomeAssistant, api: NormanBlindsApiClient) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: NormanBlindsApiClient,
+        *,
+        store: Store | None = None,
+        fast_interval: float = DEFAULT_FAST_SCAN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_SCAN_INTERVAL,
+    ) -> None:
         self.api = api
+        self._fast_interval = max(MIN_POLL_GAP, fast_interval)
+        self._max_interval = max(self._fast_interval, max_interval)
+        self._base_interval = min(DEFAULT_SCAN_INTERVAL, timedelta(seconds=self._max_interval))
         super().__init__(
             hass,
             LOGGER,
             name=f"{DOMAIN} coordinator",
-            update_interval=DEFAULT_SCAN_INTERVAL,
+            update_interval=self._base_interval,
+            request_refresh_debouncer=Debouncer(
+                hass, LOGGER, cooldown=MIN_POLL_GAP, immediate=True
+            ),
+        )
+        self._changes: dict[str, dict[Any, frozenset[str] | None]] | None = None
+        self._notified_success: bool | None = None
+        self._fast_polls_remaining = 0
+        self._store = store
+        self._saved_generation: int | None = None
+        self.data_is_cached = False
+        self.commands = NormanBlindsCommandTracker(
+            hass, self.get_window, self.async_request_refresh
+        )
+        self._breaker_state = api.breaker.state
+        self._unsub_breaker: CALLBACK_TYPE | None = api.breaker.add_listener(
+            self._async_breaker_changed
         )
 
     async def _async_update_data(self) -> dict[str, Any]:
@@ -29,10 +207,225 @@ class NormanBlindsDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         try:
             data = await self.api.async_get_combined_state()
             data["gateway"] = self.api.gateway_info
-            return data
+            data.update(build_snapshot_index(data))
+            changes = diff_snapshots(self.data, data)
+            self._set_room_membership(data)
         except NormanBlindsAuthError as err:
             raise ConfigEntryAuthFailed from err
         except NormanBlindsApiError as err:
+            self.update_interval = self._base_interval
             raise UpdateFailed(str(err)) from err
         except Exception as err:  # pylint: disable=broad-except
+            self.update_interval = self._base_interval
             raise UpdateFailed(str(err)) from err
+
+        moving = self.data is not None and any(
+            fields is not None and "position" in fields
+            for fields in changes["window"].values()
+        )
+        self._adapt_interval(moving=moving)
+        # Leaving a cached snapshot behind: wake every entity so none stays marked stale.
+        self._changes = None if self.data_is_cached else changes
+        self.data_is_cached = False
+        # A login replaces the session cookie; save it so a restart does not reuse a stale one.
+        if (
+            self.data is None
+            or any(changes.values())
+            or self.api.session_generation != self._saved_generation
+        ):
+            self.async_save_snapshot()
+        return data
+
+    async def async_restore(self) -> bool:
+        """Load the last saved snapshot and session; return True if there was one."""
+
+        if self._store is None or (stored := await self._store.async_load()) is None:
+            return False
+        try:
+            data: dict[str, Any] = {
+                "rooms": [NormanRoom.from_dict(room) for room in stored["rooms"]],
+                "windows": [NormanWindow.from_dict(window) for window in stored["windows"]],
+                "gateway": stored.get("gateway") or {},
+            }
+        except (KeyError, TypeError, AttributeError) as err:
+            LOGGER.debug("Ignoring unreadable saved snapshot: %s", err)
+            return False
+
+        self.api.restore_session(stored.get("session") or {})
+        self._saved_generation = self.api.session_generation
+        data.update(build_snapshot_index(data))
+        self._set_room_membership(data)
+        self.data = data
+        self.data_is_cached = True
+        return True
+
+    @callback
+    def async_save_snapshot(self) -> None:
+        """Schedule writing the snapshot and session to the store."""
+
+        if self._store is None:
+            return
+        self._saved_generation = self.api.session_generation
+        self._store.async_delay_save(self._snapshot_to_store, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot_to_store(self) -> dict[str, Any]:
+        """Return the current snapshot and session in storable form."""
+
+        data = self.data or {}
+        return {
+            "rooms": [room.as_dict() for room in data.get("rooms", [])],
+            "windows": [window.as_dict() for window in data.get("windows", [])],
+            "gateway": data.get("gateway") or {},
+            "session": self.api.export_session(),
+        }
+
+    def _set_room_membership(self, data: dict[str, Any]) -> None:
+        """Tell the API client which windows make up each room."""
+
+        self.api.set_room_membership(
+            {
+                room_id: frozenset(window.id for window in windows)
+                for room_id, windows in data["windows_by_room"].items()
+            }
+        )
+
+    def _adapt_interval(self, *, moving: bool) -> None:
+        """Pick the next poll interval from recent activity."""
+
+        if moving or self._fast_polls_remaining > 0:
+            self._fast_polls_remaining = max(0, self._fast_polls_remaining - 1)
+            seconds = self._fast_interval
+        else:
+            current = self.update_interval.total_seconds() if self.update_interval else 0
+            seconds = min(self._max_interval, max(self._fast_interval, current * 2))
+        self.update_interval = timedelta(seconds=seconds)
+
+    @callback
+    def _async_breaker_changed(self) -> None:
+        """Refresh right away when the hub becomes reachable again."""
+
+        previous, self._breaker_state = self._breaker_state, self.api.breaker.state
+        if self._breaker_state == STATE_CLOSED and previous != STATE_CLOSED:
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_note_command(self) -> None:
+        """Switch to fast polling after a command was sent to the hub."""
+
+        self._fast_polls_remaining = FAST_POLLS_AFTER_COMMAND
+        self.update_interval = timedelta(seconds=self._fast_interval)
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose window or room changed.
+
+        Listeners without a context are always called, topology listeners
+        only when window/room ids change, and everyone is woken when
+        availability flips.
+        """
+
+        changes, self._changes = self._changes, None
+        if changes is None or self._notified_success != self.last_update_success:
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            if self.last_update_success:
+                self.commands.async_check()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if _context_changed(context, changes):
+                update_callback()
+
+        self.commands.async_check()
+
+    @callback
+    def async_track_command(self, targets: dict[Any, int | None]) -> None:
+        """Poll fast and follow up until the commanded windows reach ``targets``.
+
+        Targets are gateway positions keyed by window id; use ``None`` when the
+        resulting position is not known in advance (presets).
+        """
+
+        self.async_note_command()
+        self.commands.async_track(targets)
+
+    async def async_shutdown(self) -> None:
+        """Cancel follow-up polls and stop watching the circuit breaker."""
+
+        self.commands.async_cancel()
+        if self._unsub_breaker is not None:
+            self._unsub_breaker()
+            self._unsub_breaker = None
+        await super().async_shutdown()
+
+    @callback
+    def async_add_window_listener(
+        self,
+        window_id: Any,
+        update_callback: CALLBACK_TYPE,
+        fields: Iterable[str] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for changes to a single window; returns an unsubscribe callback."""
+
+        return self.async_add_listener(update_callback, window_context(window_id, fields))
+
+    @callback
+    def async_add_topology_listener(
+        self, update_callback: Callable[[set[Any], set[Any]], None]
+    ) -> CALLBACK_TYPE:
+        """Call ``update_callback(new_window_ids, new_room_ids)`` when ids appear.
+
+        The callback only runs when the topology version changes, and only
+        with ids this listener has not been told about before, so platforms
+        never rebuild entities just to compare unique ids.
+        """
+
+        data = self.data or {}
+        known_windows: set[Any] = set(data.get("windows_by_id", {}))
+        known_rooms: set[Any] = set(data.get("room_ids", ()))
+        version = data.get("topology_version")
+
+        @callback
+        def _handle_topology_update() -> None:
+            nonlocal version
+            data = self.data or {}
+            if data.get("topology_version") == version:
+                return
+            version = data.get("topology_version")
+            new_windows = data.get("windows_by_id", {}).keys() - known_windows
+            new_rooms = data.get("room_ids", frozenset()) - known_rooms
+            if not new_windows and not new_rooms:
+                return
+            known_windows.update(new_windows)
+            known_rooms.update(new_rooms)
+            update_callback(set(new_windows), set(new_rooms))
+
+        return self.async_add_listener(_handle_topology_update, TOPOLOGY_CONTEXT)
+
+    def get_window(self, window_id: Any) -> NormanWindow | None:
+        """Return the window record for an id."""
+
+        return (self.data or {}).get("windows_by_id", {}).get(window_id)
+
+    def get_room(self, room_id: Any) -> NormanRoom | None:
+        """Return the room record for an id, if the gateway reported it."""
+
+        return (self.data or {}).get("rooms_by_id", {}).get(room_id)
+
+    def get_room_windows(self, room_id: Any) -> list[NormanWindow]:
+        """Return the window records belonging to a room."""
+
+        return (self.data or {}).get("windows_by_room", {}).get(room_id, [])
+
+    def get_room_aggregate(self, room_id: Any) -> NormanRoomAggregate | None:
+        """Return the precomputed member summary for a room."""
+
+        return (self.data or {}).get("room_aggregates", {}).get(room_id)
+
+    def has_room(self, room_id: Any) -> bool:
+        """Return True if the room is known from room info or window membership."""
+
+        aggregate = self.get_room_aggregate(room_id)
+        return aggregate is not None and aggregate.present
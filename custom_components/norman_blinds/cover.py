@@ -1,18 +1,20 @@
 """Cover platform for Norman Blinds."""
 from __future__ import annotations
 
-import asyncio
+from collections.abc import Iterable
 from typing import Any
 
 from homeassistant.components.cover import CoverDeviceClass, CoverEntity, CoverEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import ATTR_VIA_DEVICE
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ALLOWED_POSITIONS, DEFAULT_REFRESH_DELAY, DOMAIN, LOGGER
-from .coordinator import NormanBlindsDataUpdateCoordinator
+from .command_queue import COMMAND_SUPERSEDED
+from .const import ALLOWED_POSITIONS, DOMAIN, LOGGER
+from .coordinator import NormanBlindsDataUpdateCoordinator, room_context, window_context
+from .models import NormanRoom, NormanWindow
 
 
 async def async_setup_entry(
@@ -23,44 +25,29 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator: NormanBlindsDataUpdateCoordinator = data["coordinator"]
 
-    entities: list[CoverEntity] = []
-
-    def _build_entities() -> list[CoverEntity]:
+    def _build_entities(
+        rooms: Iterable[NormanRoom], windows: Iterable[NormanWindow]
+    ) -> list[CoverEntity]:
         local_entities: list[CoverEntity] = []
-        for room in coordinator.data.get("rooms", []):
+        for room in rooms:
             local_entities.append(NormanBlindsRoomCover(coordinator, room))
-        for item in coordinator.data.get("windows", []):
-            window = item.get("window") or {}
-            room = item.get("room") or {}
-            suggested_area = item.get("suggested_area") or room.get("Name")
-
-            entity = NormanBlindsCover(coordinator, window, suggested_area)
-            local_entities.append(entity)
+        for window in windows:
+            local_entities.append(NormanBlindsCover(coordinator, window))
         return local_entities
 
     # Initial batch from current data.
-    entities.extend(_build_entities())
-    async_add_entities(entities)
-
-    seen_ids: set[str] = {entity.unique_id for entity in entities if entity.unique_id}
-
-    async def _async_add_new_entities() -> None:
-        new_entities = _build_entities()
-        to_add = [
-            entity
-            for entity in new_entities
-            if entity.unique_id and entity.unique_id not in seen_ids
-        ]
-        if not to_add:
-            return
-
-        seen_ids.update(entity.unique_id for entity in to_add if entity.unique_id)
-        async_add_entities(to_add)
+    async_add_entities(
+        _build_entities(coordinator.data.get("rooms", []), coordinator.data.get("windows", []))
+    )
 
-    def _handle_coordinator_update() -> None:
-        coordinator.hass.async_create_task(_async_add_new_entities())
+    @callback
+    def _async_add_new_entities(window_ids: set[Any], room_ids: set[Any]) -> None:
+        rooms = [room for rid in room_ids if (room := coordinator.get_room(rid)) is not None]
+        windows = [window for wid in window_ids if (window := coordinator.get_window(wid)) is not None]
+        if to_add := _build_entities(rooms, windows):
+            async_add_entities(to_add)
 
-    coordinator.async_add_listener(_handle_coordinator_update)
+    entry.async_on_unload(coordinator.async_add_topology_listener(_async_add_new_entities))
 
 
 class NormanBlindsRoomCover(CoordinatorEntity[NormanBlindsDataUpdateCoordinator], CoverEntity):
@@ -78,12 +65,15 @@ class NormanBlindsRoomCover(CoordinatorEntity[NormanBlindsDataUpdateCoordinator]
     _attr_current_cover_position: int | None = None
     _attr_is_closed: bool | None = None
 
-    def __init__(self, coordinator: NormanBlindsDataUpdateCoordinator, room: dict[str, Any]) -> None:
+    def __init__(self, coordinator: NormanBlindsDataUpdateCoordinator, room: NormanRoom) -> None:
         """Initialize the room cover entity."""
 
-        super().__init__(coordinator)
-        self._room_id: int | str | None = room.get("Id") or room.get("id") or room.get("roomId")
-        room_name = room.get("Name") or room.get("name") or room.get("roomName")
+        super().__init__(
+            coordinator,
+            room_context(room.id, ("mean_open", "min_open", "max_open", "all_closed", "present")),
+        )
+        self._room_id: int | str | None = room.id
+        room_name = room.name
         if not room_name and self._room_id is not None:
             room_name = f"Room {self._room_id}"
         self._room_name = room_name
@@ -115,6 +105,12 @@ class NormanBlindsRoomCover(CoordinatorEntity[NormanBlindsDataUpdateCoordinator]
 
         return bool(self._attr_available) and bool(self.coordinator.last_update_success)
 
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the state comes from the snapshot saved before restart."""
+
+        return self.coordinator.data_is_cached
+
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
 
@@ -124,36 +120,22 @@ class NormanBlindsRoomCover(CoordinatorEntity[NormanBlindsDataUpdateCoordinator]
     def _update_from_state(self) -> None:
         """Update state based on member windows."""
 
-        windows = self.coordinator.data.get("windows", [])
-        open_positions: list[int] = []
-        for item in windows:
-            window = item.get("window") or {}
-            room_id = (
-                window.get("roomId")
-                or window.get("room_id")
-                or window.get("room")
-                or window.get("RId")
-            )
-            if room_id != self._room_id:
-                continue
-            position = window.get("position")
-            if isinstance(position, (int, float)):
-                open_positions.append(max(0, min(100, 100 - int(position))))
-
-        if open_positions:
-            avg_open = int(sum(open_positions) / len(open_positions))
-            self._attr_current_cover_position = avg_open
-            self._attr_is_closed = avg_open == 0
-            self._attr_available = True
-        else:
-            # Room exists but no windows found in current payload
-            rooms = self.coordinator.data.get("rooms") or []
-            self._attr_available = any(
-                (room.get("Id") or room.get("id") or room.get("roomId")) == self._room_id
-                for room in rooms
-            )
+        aggregate = self.coordinator.get_room_aggregate(self._room_id)
+        if aggregate is None:
+            self._attr_available = False
             self._attr_current_cover_position = None
             self._attr_is_closed = None
+            self._attr_extra_state_attributes = {}
+            return
+
+        # A listed room with no positioned windows stays available with unknown state.
+        self._attr_available = aggregate.present
+        self._attr_current_cover_position = aggregate.mean_open
+        self._attr_is_closed = aggregate.all_closed
+        self._attr_extra_state_attributes = {
+            "min_position": aggregate.min_open,
+            "max_position": aggregate.max_open,
+        }
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Set cover position (0-100 open) for all blinds in the room."""
@@ -203,18 +185,16 @@ class NormanBlindsRoomCover(CoordinatorEntity[NormanBlindsDataUpdateCoordinator]
             LOGGER.warning("Cannot set position; missing room id for %s", self.name)
             return
 
-        await self.coordinator.api.async_set_room_position(self._room_id, target)
+        result = await self.coordinator.api.async_set_room_position(self._room_id, target)
+        if result is COMMAND_SUPERSEDED:
+            return
+        self.coordinator.async_track_command(
+            {window.id: target for window in self.coordinator.get_room_windows(self._room_id)}
+        )
         open_percent = max(0, min(100, 100 - target))
         self._attr_current_cover_position = open_percent
         self._attr_is_closed = open_percent == 0
         self.async_write_ha_state()
-        self.coordinator.hass.async_create_task(self._delayed_refresh())
-
-    async def _delayed_refresh(self) -> None:
-        """Refresh after a small delay to allow the hub to update."""
-
-        await asyncio.sleep(DEFAULT_REFRESH_DELAY)
-        await self.coordinator.async_request_refresh()
 
 
 class NormanBlindsCover(CoordinatorEntity[NormanBlindsDataUpdateCoordinator], CoverEntity):
@@ -235,15 +215,15 @@ class NormanBlindsCover(CoordinatorEntity[NormanBlindsDataUpdateCoordinator], Co
     def __init__(
         self,
         coordinator: NormanBlindsDataUpdateCoordinator,
-        window: dict[str, Any],
-        suggested_area: str | None,
+        window: NormanWindow,
         ) -> None:
         """Initialize the cover entity."""
 
-        super().__init__(coordinator)
-        self._window_id: int | str | None = window.get("Id") or window.get("id")
+        super().__init__(coordinator, window_context(window.id, ("position",)))
+        self._window_id: int | str | None = window.id
+        suggested_area = window.room_name
         self._room_name: str | None = suggested_area
-        self._window_name: str | None = window.get("Name")
+        self._window_name: str | None = window.name
         self._attr_unique_id = str(self._window_id) if self._window_id is not None else None
         if self._room_name and self._window_name:
             self._attr_name = f"{self._room_name} - {self._window_name}"
@@ -282,16 +262,19 @@ class NormanBlindsCover(CoordinatorEntity[NormanBlindsDataUpdateCoordinator], Co
 
         return bool(self._attr_available) and bool(self.coordinator.last_update_success)
 
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the state comes from the snapshot saved before restart."""
+
+        return self.coordinator.data_is_cached
+
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
 
-        windows = self.coordinator.data.get("windows", [])
-        for item in windows:
-            window = item.get("window") or {}
-            if (window.get("Id") or window.get("id")) == self._window_id:
-                self._update_from_window(window)
-                self._attr_available = True
-                break
+        window = self.coordinator.get_window(self._window_id)
+        if window is not None:
+            self._update_from_window(window)
+            self._attr_available = True
         else:
             self._attr_available = False
 
@@ -304,13 +287,11 @@ class NormanBlindsCover(CoordinatorEntity[NormanBlindsDataUpdateCoordinator], Co
         # Guard against missing attribute initialization
         return getattr(self, "_attr_is_closed", None)
 
-    def _update_from_window(self, window: dict[str, Any]) -> None:
-        """Update internal state from window payload."""
+    def _update_from_window(self, window: NormanWindow) -> None:
+        """Update internal state from the window record."""
 
-        position = window.get("position")
-        if isinstance(position, (int, float)):
-            closed_percent = int(position)
-            open_percent = max(0, min(100, 100 - closed_percent))
+        if window.position is not None:
+            open_percent = max(0, min(100, 100 - window.position))
             self._attr_current_cover_position = open_percent
             self._attr_is_closed = open_percent == 0
         else:
@@ -368,15 +349,11 @@ class NormanBlindsCover(CoordinatorEntity[NormanBlindsDataUpdateCoordinator], Co
             LOGGER.warning("Cannot set position; missing window id for %s", self.name)
             return
 
-        await self.coordinator.api.async_set_window_position(self._window_id, target)
+        result = await self.coordinator.api.async_set_window_position(self._window_id, target)
+        if result is COMMAND_SUPERSEDED:
+            return
+        self.coordinator.async_track_command({self._window_id: target})
         open_percent = max(0, min(100, 100 - target))
         self._attr_current_cover_position = open_percent
         self._attr_is_closed = open_percent == 0
         self.async_write_ha_state()
-        self.coordinator.hass.async_create_task(self._delayed_refresh())
-
-    async def _delayed_refresh(self) -> None:
-        """Refresh after a small delay to allow the hub to update."""
-
-        await asyncio.sleep(DEFAULT_REFRESH_DELAY)
-        await self.coordinator.async_request_refresh()
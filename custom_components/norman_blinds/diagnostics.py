@@ -0,0 +1,45 @@
+"""Diagnostics support for Norman Blinds."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PASSWORD, DOMAIN
+
+TO_REDACT = {CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+
+    data = hass.data[DOMAIN][entry.entry_id]
+    api = data["api"]
+    coordinator = data["coordinator"]
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "gateway": api.gateway_info,
+        "session": api.session_diagnostics,
+        "requests": api.request_metrics,
+        "latency": api.latency.diagnostics,
+        "request_stats": api.stats.diagnostics,
+        "circuit_breaker": api.breaker.diagnostics,
+        "connection": {**data["connection"].metrics, "reconnects": api.reconnects},
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": (
+                coordinator.update_interval.total_seconds() if coordinator.update_interval else None
+            ),
+            "rooms": len((coordinator.data or {}).get("rooms_by_id", {})),
+            "windows": len((coordinator.data or {}).get("windows_by_id", {})),
+            "pending_commands": coordinator.commands.pending,
+        },
+    }
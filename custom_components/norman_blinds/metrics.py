@@ -0,0 +1,185 @@
+"""Per-endpoint latency and request metrics for gateway requests."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from typing import Any
+
+from .const import (
+    DEFAULT_REQUEST_TIMEOUT,
+    LATENCY_HISTOGRAM_BUCKETS,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_SAMPLES,
+    REQUEST_TIMEOUT_CEILING,
+    REQUEST_TIMEOUT_FLOOR,
+    REQUEST_TIMEOUT_P99_MULTIPLIER,
+)
+
+LOGIN_INITIAL = "initial"
+LOGIN_RELOGIN = "relogin"
+LOGIN_RENEWAL = "renewal"
+LOGIN_PROBE = "probe"
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of already sorted ``samples``."""
+
+    index = min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))
+    return samples[index]
+
+
+class NormanBlindsLatencyTracker:
+    """Keep a rolling latency window per endpoint and derive timeouts from it.
+
+    Once an endpoint has ``LATENCY_MIN_SAMPLES`` samples, its timeout is
+    ``REQUEST_TIMEOUT_P99_MULTIPLIER`` times its p99, clamped between
+    ``REQUEST_TIMEOUT_FLOOR`` and ``REQUEST_TIMEOUT_CEILING``; before that
+    ``DEFAULT_REQUEST_TIMEOUT`` applies. A timed-out request is recorded at
+    its timeout, so an endpoint that is genuinely getting slower (e.g. a
+    large ``getWindowInfo`` on a busy hub) stretches its own timeout.
+
+    Every duration is also counted in a histogram with
+    ``LATENCY_HISTOGRAM_BUCKETS`` upper bounds, kept since startup.
+    """
+
+    def __init__(self) -> None:
+        self._samples: dict[str, deque[float]] = {}
+        self._histograms: dict[str, list[int]] = {}
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Add a request duration for ``endpoint``."""
+
+        if (samples := self._samples.get(endpoint)) is None:
+            samples = self._samples[endpoint] = deque(maxlen=LATENCY_SAMPLES)
+            self._histograms[endpoint] = [0] * (len(LATENCY_HISTOGRAM_BUCKETS) + 1)
+        samples.append(seconds)
+        self._histograms[endpoint][bisect_left(LATENCY_HISTOGRAM_BUCKETS, seconds)] += 1
+
+    def median(self, endpoint: str) -> float | None:
+        """Return the median of the recent durations for ``endpoint``, if any."""
+
+        if not (samples := self._samples.get(endpoint)):
+            return None
+        return _percentile(sorted(samples), 0.5)
+
+    def timeout_for(self, endpoint: str) -> float:
+        """Return the timeout to use for the next request to ``endpoint``."""
+
+        samples = self._samples.get(endpoint)
+        if samples is None or len(samples) < LATENCY_MIN_SAMPLES:
+            return DEFAULT_REQUEST_TIMEOUT
+        p99 = _percentile(sorted(samples), 0.99)
+        return min(
+            REQUEST_TIMEOUT_CEILING,
+            max(REQUEST_TIMEOUT_FLOOR, p99 * REQUEST_TIMEOUT_P99_MULTIPLIER),
+        )
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return latency percentiles and the current timeout per endpoint."""
+
+        result: dict[str, Any] = {}
+        for endpoint, samples in self._samples.items():
+            ordered = sorted(samples)
+            result[endpoint] = {
+                "samples": len(ordered),
+                "p50": round(_percentile(ordered, 0.5), 3),
+                "p99": round(_percentile(ordered, 0.99), 3),
+                "timeout": round(self.timeout_for(endpoint), 2),
+                "histogram": dict(
+                    zip(
+                        [f"<={bound}" for bound in LATENCY_HISTOGRAM_BUCKETS] + ["inf"],
+                        self._histograms[endpoint],
+                    )
+                ),
+            }
+        return result
+
+
+class _EndpointCounters:
+    """Running totals for one endpoint."""
+
+    __slots__ = ("responses", "errors", "timeouts", "retries", "bytes", "last_bytes", "max_bytes")
+
+    def __init__(self) -> None:
+        self.responses = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.bytes = 0
+        self.last_bytes = 0
+        self.max_bytes = 0
+
+
+class NormanBlindsRequestStats:
+    """Count responses, failures, retries and payload sizes per endpoint.
+
+    ``errors`` covers failed requests and hub error codes, ``timeouts``
+    requests that hit their timeout, and ``retries`` requests sent again
+    after a dropped connection or a rejected session. Logins are counted
+    by reason: the first one, a re-login after the hub rejected the
+    session, a renewal ahead of expiry, or a probe while the hub is down.
+    Counters run since the client was created.
+    """
+
+    def __init__(self) -> None:
+        self._endpoints: dict[str, _EndpointCounters] = {}
+        self.logins: dict[str, int] = {}
+
+    def _counters(self, endpoint: str) -> _EndpointCounters:
+        if (counters := self._endpoints.get(endpoint)) is None:
+            counters = self._endpoints[endpoint] = _EndpointCounters()
+        return counters
+
+    def record_response(self, endpoint: str, size: int) -> None:
+        """Count a response body of ``size`` bytes."""
+
+        counters = self._counters(endpoint)
+        counters.responses += 1
+        counters.bytes += size
+        counters.last_bytes = size
+        if size > counters.max_bytes:
+            counters.max_bytes = size
+
+    def record_error(self, endpoint: str) -> None:
+        """Count a failed request or a hub error code."""
+
+        self._counters(endpoint).errors += 1
+
+    def record_timeout(self, endpoint: str) -> None:
+        """Count a request that timed out."""
+
+        self._counters(endpoint).timeouts += 1
+
+    def record_retry(self, endpoint: str) -> None:
+        """Count a request that is being sent again."""
+
+        self._counters(endpoint).retries += 1
+
+    def record_login(self, reason: str) -> None:
+        """Count a completed login."""
+
+        self.logins[reason] = self.logins.get(reason, 0) + 1
+
+    def last_bytes(self, endpoint: str) -> int | None:
+        """Return the size of the latest response from ``endpoint``."""
+
+        counters = self._endpoints.get(endpoint)
+        return counters.last_bytes if counters is not None else None
+
+    def total(self, counter: str) -> int:
+        """Return ``errors``, ``timeouts`` or ``retries`` summed over endpoints."""
+
+        return sum(getattr(counters, counter) for counters in self._endpoints.values())
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the counters per endpoint and the login counts."""
+
+        return {
+            "endpoints": {
+                endpoint: {name: getattr(counters, name) for name in _EndpointCounters.__slots__}
+                for endpoint, counters in self._endpoints.items()
+            },
+            "logins": dict(self.logins),
+        }
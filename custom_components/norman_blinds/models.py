@@ -0,0 +1,225 @@
+"""Normalized records for gateway rooms and windows."""
+from __future__ import annotations
+
+from typing import Any
+
+
+def _as_int(value: Any) -> int | None:
+    """Return value as an int, accepting numeric strings such as battery "74"."""
+
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(float(value))
+        except ValueError:
+            return None
+    return None
+
+
+def _as_number(value: Any) -> int | float | None:
+    """Return value as an int or float, or None if it is not numeric."""
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return None
+        return int(number) if number.is_integer() else number
+    return None
+
+
+class _Record:
+    """Slotted record compared field by field."""
+
+    __slots__: tuple[str, ...] = ()
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def diff(self, other: _Record) -> frozenset[str]:
+        """Return the names of fields whose values differ from ``other``."""
+
+        return frozenset(
+            field for field in self.__slots__ if getattr(self, field) != getattr(other, field)
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record as a plain dict."""
+
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Any:
+        """Rebuild a record saved with ``as_dict``; missing fields become None."""
+
+        record = cls.__new__(cls)
+        for field in cls.__slots__:
+            setattr(record, field, data.get(field))
+        return record
+
+
+class NormanRoom(_Record):
+    """A room as reported by getRoomInfo."""
+
+    __slots__ = ("id", "name")
+
+    def __init__(self, room_id: Any, name: str | None) -> None:
+        self.id = room_id
+        self.name = name
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> NormanRoom:
+        """Build a room from a raw gateway payload."""
+
+        return cls(
+            payload.get("Id") or payload.get("id") or payload.get("roomId"),
+            payload.get("Name") or payload.get("name") or payload.get("roomName"),
+        )
+
+
+class NormanWindow(_Record):
+    """A blind as reported by getWindowInfo, with its room name resolved.
+
+    Only the fields the platforms use are kept; ``scenes``, ``level`` and
+    ``levelsort`` arrays from the raw payload are dropped at ingest. The
+    window's own ``roomName`` is kept as the room name until it is resolved
+    against the room list.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "room_id",
+        "room_name",
+        "group_id",
+        "position",
+        "battery",
+        "rssi",
+        "temp",
+        "solar",
+        "usb",
+        "ver",
+        "model",
+    )
+
+    def __init__(
+        self,
+        window_id: Any,
+        *,
+        name: str | None = None,
+        room_id: Any = None,
+        room_name: str | None = None,
+        group_id: int | None = None,
+        position: int | None = None,
+        battery: int | None = None,
+        rssi: int | None = None,
+        temp: int | float | None = None,
+        solar: int | None = None,
+        usb: int | None = None,
+        ver: str | None = None,
+        model: int | None = None,
+    ) -> None:
+        self.id = window_id
+        self.name = name
+        self.room_id = room_id
+        self.room_name = room_name
+        self.group_id = group_id
+        self.position = position
+        self.battery = battery
+        self.rssi = rssi
+        self.temp = temp
+        self.solar = solar
+        self.usb = usb
+        self.ver = ver
+        self.model = model
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> NormanWindow:
+        """Build a window from a raw gateway payload."""
+
+        ver = payload.get("ver")
+        return cls(
+            payload.get("Id") or payload.get("id"),
+            name=payload.get("Name"),
+            room_id=(
+                payload.get("roomId")
+                or payload.get("room_id")
+                or payload.get("room")
+                or payload.get("RId")
+            ),
+            room_name=payload.get("roomName"),
+            group_id=_as_int(payload.get("groupId")),
+            position=_as_int(payload.get("position")),
+            battery=_as_int(payload.get("battery")),
+            rssi=_as_int(payload.get("Rssi")),
+            temp=_as_number(payload.get("temp")),
+            solar=_as_int(payload.get("solar")),
+            usb=_as_int(payload.get("usb")),
+            ver=str(ver) if ver is not None else None,
+            model=_as_int(payload.get("model")),
+        )
+
+
+class NormanRoomAggregate(_Record):
+    """Per-room summary of member windows, computed once per refresh.
+
+    Open percentages follow the cover convention (100 = fully open), i.e.
+    ``100 - position`` for each member that reports a position.
+    """
+
+    __slots__ = ("room_id", "members", "mean_open", "min_open", "max_open", "all_closed", "present")
+
+    def __init__(
+        self,
+        room_id: Any,
+        members: tuple[Any, ...],
+        *,
+        mean_open: int | None = None,
+        min_open: int | None = None,
+        max_open: int | None = None,
+        all_closed: bool | None = None,
+        present: bool = False,
+    ) -> None:
+        self.room_id = room_id
+        self.members = members
+        self.mean_open = mean_open
+        self.min_open = min_open
+        self.max_open = max_open
+        self.all_closed = all_closed
+        self.present = present
+
+    @classmethod
+    def from_windows(
+        cls, room_id: Any, windows: list[NormanWindow], *, listed: bool
+    ) -> NormanRoomAggregate:
+        """Summarize a room's windows; ``listed`` is True if getRoomInfo reported it."""
+
+        open_positions = [
+            max(0, min(100, 100 - window.position))
+            for window in windows
+            if window.position is not None
+        ]
+        if not open_positions:
+            return cls(room_id, tuple(window.id for window in windows), present=listed or bool(windows))
+        return cls(
+            room_id,
+            tuple(window.id for window in windows),
+            mean_open=int(sum(open_positions) / len(open_positions)),
+            min_open=min(open_positions),
+            max_open=max(open_positions),
+            all_closed=max(open_positions) == 0,
+            present=True,
+        )
@@ -0,0 +1,156 @@
+"""Prioritized scheduling of requests to the gateway."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import heapq
+import itertools
+import time
+from typing import Any, TypeVar
+
+from .const import LOGGER
+
+_T = TypeVar("_T")
+
+PRIORITY_COMMAND = 0
+PRIORITY_PRESET = 1
+PRIORITY_POLL = 2
+PRIORITY_DIAGNOSTIC = 3
+
+PRIORITY_NAMES: dict[int, str] = {
+    PRIORITY_COMMAND: "command",
+    PRIORITY_PRESET: "preset",
+    PRIORITY_POLL: "poll",
+    PRIORITY_DIAGNOSTIC: "diagnostic",
+}
+
+
+class NormanBlindsRequestScheduler:
+    """Run gateway requests at most ``max_concurrent`` at a time, by priority.
+
+    When every slot is busy, callers wait in a priority queue: user
+    commands are started before presets, presets before polls and polls
+    before diagnostics, in arrival order within a class. Work started
+    through ``async_single_flight`` is shared: while it runs, later callers
+    with the same key await its result instead of starting it again, and
+    a result younger than ``max_age`` seconds is reused outright.
+    """
+
+    def __init__(self, max_concurrent: int = 1) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._shared: dict[Hashable, asyncio.Task[Any]] = {}
+        self._recent: dict[Hashable, tuple[float, Any]] = {}
+        self._queued = dict.fromkeys(PRIORITY_NAMES, 0)
+        self._completed = dict.fromkeys(PRIORITY_NAMES, 0)
+        self._peak_queued = 0
+        self._shared_hits = 0
+        self._reused_hits = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of jobs waiting for a slot."""
+
+        return len(self._waiters)
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return queue depth and throughput counters."""
+
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self._active,
+            "queued": {PRIORITY_NAMES[p]: depth for p, depth in self._queued.items()},
+            "peak_queued": self._peak_queued,
+            "completed": {PRIORITY_NAMES[p]: count for p, count in self._completed.items()},
+            "shared": self._shared_hits,
+            "reused": self._reused_hits,
+        }
+
+    async def async_run(self, priority: int, job: Callable[[], Awaitable[_T]]) -> _T:
+        """Run ``job`` while holding a slot, waiting behind higher-priority jobs."""
+
+        await self._async_acquire(priority)
+        try:
+            return await job()
+        finally:
+            self._completed[priority] += 1
+            self._release()
+
+    async def async_single_flight(
+        self, key: Hashable, job: Callable[[], Awaitable[_T]], *, max_age: float = 0
+    ) -> _T:
+        """Run ``job`` unless one with the same ``key`` is in flight; then share its result.
+
+        A successful result is also reused by callers arriving within
+        ``max_age`` seconds of it completing.
+        """
+
+        if max_age > 0 and (recent := self._recent.get(key)) is not None:
+            completed_at, result = recent
+            if time.monotonic() - completed_at < max_age:
+                self._reused_hits += 1
+                return result
+
+        task = self._shared.get(key)
+        if task is not None:
+            self._shared_hits += 1
+            LOGGER.debug("Joining in-flight %s instead of starting another", key)
+        else:
+            task = asyncio.get_running_loop().create_task(job())
+            self._shared[key] = task
+            task.add_done_callback(lambda done: self._finish_shared(key, done))
+        # Shield so one caller giving up does not cancel the work for the others.
+        return await asyncio.shield(task)
+
+    def expire(self, *keys: Hashable) -> None:
+        """Forget recent results for ``keys`` (all keys if none are given)."""
+
+        if not keys:
+            self._recent.clear()
+        for key in keys:
+            self._recent.pop(key, None)
+
+    def _finish_shared(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Drop a finished shared task and remember its result if it succeeded."""
+
+        self._shared.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._recent[key] = (time.monotonic(), task.result())
+
+    async def _async_acquire(self, priority: int) -> None:
+        """Wait until a slot is handed to this caller."""
+
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        self._queued[priority] += 1
+        self._peak_queued = max(self._peak_queued, len(self._waiters))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on.
+                self._release()
+            else:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+        finally:
+            self._queued[priority] -= 1
+
+    def _release(self) -> None:
+        """Hand the slot to the highest-priority waiter, or free it."""
+
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
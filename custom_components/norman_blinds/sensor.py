@@ -1,22 +1,41 @@
 """Diagnostic sensors for Norman Blinds."""
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.const import PERCENTAGE, SIGNAL_STRENGTH_DECIBELS, UnitOfTemperature
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-from .coordinator import NormanBlindsDataUpdateCoordinator
+from .api import NormanBlindsApiClient
+from .circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
+from .const import (
+    DOMAIN,
+    LOGIN_ENDPOINT,
+    REMOTE_CONTROL_ENDPOINT,
+    ROOM_INFO_ENDPOINT,
+    WINDOW_INFO_ENDPOINT,
+)
+from .coordinator import NormanBlindsDataUpdateCoordinator, window_context
+from .metrics import LOGIN_RELOGIN
+from .models import NormanWindow
 
 
 async def async_setup_entry(
@@ -27,85 +46,132 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator: NormanBlindsDataUpdateCoordinator = data["coordinator"]
 
-    entities: list[SensorEntity] = []
+    # Windows with sensor fields the hub has not reported yet, watched until they appear.
+    field_watchers: dict[Any, CALLBACK_TYPE] = {}
+
+    @callback
+    def _async_watch_missing_fields(window: NormanWindow) -> None:
+        """Add a window's sensors for fields that only show up in a later refresh."""
+
+        window_id = window.id
+        missing = {desc.field for desc in WINDOW_SENSORS if getattr(window, desc.field) is None}
+        if window_id is None or not missing or window_id in field_watchers:
+            return
+
+        @callback
+        def _async_fields_changed() -> None:
+            if (current := coordinator.get_window(window_id)) is None:
+                return
+            appeared = {field for field in missing if getattr(current, field) is not None}
+            if not appeared:
+                return
+            missing.difference_update(appeared)
+            async_add_entities(create_window_sensors(coordinator, current, appeared))
+            if not missing:
+                field_watchers.pop(window_id)()
+
+        field_watchers[window_id] = coordinator.async_add_window_listener(
+            window_id, _async_fields_changed, missing
+        )
+
+    @callback
+    def _async_unwatch_fields() -> None:
+        for unsubscribe in field_watchers.values():
+            unsubscribe()
+        field_watchers.clear()
+
+    entry.async_on_unload(_async_unwatch_fields)
 
-    def _build_entities() -> list[SensorEntity]:
+    def _build_entities(windows: Iterable[NormanWindow]) -> list[SensorEntity]:
         local_entities: list[SensorEntity] = []
-        for item in coordinator.data.get("windows", []):
-            window = item.get("window") or {}
-            room = item.get("room") or {}
-            suggested_area = item.get("suggested_area") or room.get("Name")
-            local_entities.extend(create_window_sensors(coordinator, window, suggested_area))
+        for window in windows:
+            local_entities.extend(create_window_sensors(coordinator, window))
+            _async_watch_missing_fields(window)
         return local_entities
 
     # Initial batch from current data
-    entities.extend(_build_entities())
-    async_add_entities(entities)
-
-    seen_ids: set[str] = {entity.unique_id for entity in entities if entity.unique_id}
-
-    async def _async_add_new_entities() -> None:
-        new_entities = _build_entities()
-        to_add = [
-            entity for entity in new_entities if entity.unique_id and entity.unique_id not in seen_ids
+    async_add_entities(
+        [
+            NormanHubConnectionSensor(coordinator, entry.entry_id),
+            *(
+                NormanHubMetricSensor(coordinator, entry.entry_id, description)
+                for description in HUB_METRIC_SENSORS
+            ),
+            *_build_entities(coordinator.data.get("windows", [])),
         ]
-        if to_add:
-            seen_ids.update(entity.unique_id for entity in to_add if entity.unique_id)
+    )
+
+    @callback
+    def _async_add_new_entities(window_ids: set[Any], room_ids: set[Any]) -> None:
+        windows = [window for wid in window_ids if (window := coordinator.get_window(wid)) is not None]
+        if to_add := _build_entities(windows):
             async_add_entities(to_add)
 
-    def _handle_coordinator_update() -> None:
-        coordinator.hass.async_create_task(_async_add_new_entities())
+    entry.async_on_unload(coordinator.async_add_topology_listener(_async_add_new_entities))
+
+
+@dataclass(frozen=True, kw_only=True)
+class NormanWindowSensorEntityDescription(SensorEntityDescription):
+    """Describes a window sensor and the ``NormanWindow`` field it reads."""
 
-    coordinator.async_add_listener(_handle_coordinator_update)
+    field: str
 
 
-WINDOW_SENSORS: list[SensorEntityDescription] = [
-    SensorEntityDescription(
+WINDOW_SENSORS: list[NormanWindowSensorEntityDescription] = [
+    NormanWindowSensorEntityDescription(
         key="battery",
+        field="battery",
         name="Battery",
         device_class=SensorDeviceClass.BATTERY,
         native_unit_of_measurement=PERCENTAGE,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    NormanWindowSensorEntityDescription(
         key="Rssi",
+        field="rssi",
         name="Signal Strength",
         device_class=SensorDeviceClass.SIGNAL_STRENGTH,
         native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS,
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    NormanWindowSensorEntityDescription(
         key="temp",
+        field="temp",
         name="Temperature",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    NormanWindowSensorEntityDescription(
         key="position",
+        field="position",
         name="Position",
         native_unit_of_measurement=PERCENTAGE,
     ),
-    SensorEntityDescription(
+    NormanWindowSensorEntityDescription(
         key="solar",
+        field="solar",
         name="Solar",
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
-    SensorEntityDescription(
+    NormanWindowSensorEntityDescription(
         key="usb",
+        field="usb",
         name="USB Power",
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    NormanWindowSensorEntityDescription(
         key="ver",
+        field="ver",
         name="Firmware Version",
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    NormanWindowSensorEntityDescription(
         key="model",
+        field="model",
         name="Model",
         entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
@@ -114,12 +180,18 @@ WINDOW_SENSORS: list[SensorEntityDescription] = [
 
 
 def create_window_sensors(
-    coordinator: NormanBlindsDataUpdateCoordinator, window: dict[str, Any], room_name: str | None
+    coordinator: NormanBlindsDataUpdateCoordinator,
+    window: NormanWindow,
+    fields: Iterable[str] | None = None,
 ) -> list[SensorEntity]:
-    """Create sensors for a single window."""
+    """Create sensors for a single window, optionally only for ``fields``.
 
-    window_id = window.get("Id") or window.get("id")
-    window_name = window.get("Name") or (f"Blind {window_id}" if window_id else "Blind")
+    Fields the window does not report yet are skipped.
+    """
+
+    window_id = window.id
+    room_name = window.room_name
+    window_name = window.name or (f"Blind {window_id}" if window_id else "Blind")
     device_name = f"{room_name} - {window_name}" if room_name else window_name
     identifiers = {(DOMAIN, f"window_{window_id}")} if window_id is not None else {(DOMAIN, device_name)}
 
@@ -132,7 +204,9 @@ def create_window_sensors(
 
     sensors: list[SensorEntity] = []
     for desc in WINDOW_SENSORS:
-        value = window.get(desc.key)
+        if fields is not None and desc.field not in fields:
+            continue
+        value = getattr(window, desc.field)
         if value is None:
             continue
         entity = NormanWindowSensor(
@@ -152,6 +226,7 @@ class NormanWindowSensor(CoordinatorEntity[NormanBlindsDataUpdateCoordinator], S
     """Sensor representing a window attribute."""
 
     _attr_has_entity_name = False
+    entity_description: NormanWindowSensorEntityDescription
 
     def __init__(
         self,
@@ -160,9 +235,9 @@ class NormanWindowSensor(CoordinatorEntity[NormanBlindsDataUpdateCoordinator], S
         device_info: dict[str, Any],
         room_name: str | None,
         window_name: str,
-        description: SensorEntityDescription,
+        description: NormanWindowSensorEntityDescription,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, window_context(window_id, (description.field,)))
         self._window_id = window_id
         self._device_info = device_info
         self.entity_description = description
@@ -180,13 +255,172 @@ class NormanWindowSensor(CoordinatorEntity[NormanBlindsDataUpdateCoordinator], S
 
         return self._device_info
 
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the value comes from the snapshot saved before restart."""
+
+        return self.coordinator.data_is_cached
+
     @property
     def native_value(self) -> Any:
         """Return the current value from coordinator data."""
 
-        windows = self.coordinator.data.get("windows", [])
-        for item in windows:
-            window = item.get("window") or {}
-            if (window.get("Id") or window.get("id")) == self._window_id:
-                return window.get(self.entity_description.key)
-        return None
+        window = self.coordinator.get_window(self._window_id)
+        if window is None:
+            return None
+        return getattr(window, self.entity_description.field)
+
+
+class NormanHubConnectionSensor(CoordinatorEntity[NormanBlindsDataUpdateCoordinator], SensorEntity):
+    """Circuit breaker state for the hub: closed, open or half_open."""
+
+    _attr_has_entity_name = False
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN]
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_translation_key = "hub_connection"
+
+    def __init__(self, coordinator: NormanBlindsDataUpdateCoordinator, entry_id: str) -> None:
+        super().__init__(coordinator)
+        gateway = coordinator.data.get("gateway") or {}
+        hub_name = gateway.get("hubName") or "Norman Gateway"
+        self._attr_name = f"{hub_name} Connection"
+        self._attr_unique_id = f"{entry_id}_hub_connection"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "hub")},
+            "name": hub_name,
+            "manufacturer": "Norman",
+            "sw_version": gateway.get("swVer"),
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Follow breaker state changes as they happen, not only on polls."""
+
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.api.breaker.add_listener(self.async_write_ha_state))
+
+    @property
+    def available(self) -> bool:
+        """Stay available while the hub is down; that is what this sensor reports."""
+
+        return True
+
+    @property
+    def native_value(self) -> str:
+        """Return the breaker state."""
+
+        return self.coordinator.api.breaker.state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return failure count and probe timing."""
+
+        diagnostics = self.coordinator.api.breaker.diagnostics
+        return {
+            "consecutive_failures": diagnostics["consecutive_failures"],
+            "backoff": diagnostics["backoff"],
+        }
+
+
+@dataclass(frozen=True, kw_only=True)
+class NormanHubMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes a hub request metric and how to read it from the API client."""
+
+    value_fn: Callable[[NormanBlindsApiClient], Any]
+
+
+def _latency_description(
+    key: str, name: str, endpoint: str
+) -> NormanHubMetricSensorEntityDescription:
+    """Describe the median recent latency of ``endpoint`` in milliseconds."""
+
+    def _median_ms(api: NormanBlindsApiClient) -> float | None:
+        median = api.latency.median(endpoint)
+        return round(median * 1000) if median is not None else None
+
+    return NormanHubMetricSensorEntityDescription(
+        key=key,
+        name=name,
+        value_fn=_median_ms,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+    )
+
+
+def _total_description(key: str, name: str, counter: str) -> NormanHubMetricSensorEntityDescription:
+    """Describe a request counter summed over every endpoint."""
+
+    return NormanHubMetricSensorEntityDescription(
+        key=key,
+        name=name,
+        value_fn=lambda api: api.stats.total(counter),
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    )
+
+
+HUB_METRIC_SENSORS: list[NormanHubMetricSensorEntityDescription] = [
+    _latency_description("login_latency", "Login Latency", LOGIN_ENDPOINT),
+    _latency_description("room_info_latency", "Room Info Latency", ROOM_INFO_ENDPOINT),
+    _latency_description("window_info_latency", "Window Info Latency", WINDOW_INFO_ENDPOINT),
+    _latency_description(
+        "remote_control_latency", "Remote Control Latency", REMOTE_CONTROL_ENDPOINT
+    ),
+    NormanHubMetricSensorEntityDescription(
+        key="window_info_size",
+        name="Window Info Size",
+        value_fn=lambda api: api.stats.last_bytes(WINDOW_INFO_ENDPOINT),
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    NormanHubMetricSensorEntityDescription(
+        key="relogins",
+        name="Re-logins",
+        value_fn=lambda api: api.stats.logins.get(LOGIN_RELOGIN, 0),
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    _total_description("request_retries", "Request Retries", "retries"),
+    _total_description("request_timeouts", "Request Timeouts", "timeouts"),
+    _total_description("request_errors", "Request Errors", "errors"),
+]
+
+
+class NormanHubMetricSensor(CoordinatorEntity[NormanBlindsDataUpdateCoordinator], SensorEntity):
+    """A request metric for the hub; disabled unless the user enables it."""
+
+    _attr_has_entity_name = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    entity_description: NormanHubMetricSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: NormanBlindsDataUpdateCoordinator,
+        entry_id: str,
+        description: NormanHubMetricSensorEntityDescription,
+    ) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        gateway = coordinator.data.get("gateway") or {}
+        hub_name = gateway.get("hubName") or "Norman Gateway"
+        self._attr_name = f"{hub_name} {description.name}"
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "hub")},
+            "name": hub_name,
+            "manufacturer": "Norman",
+            "sw_version": gateway.get("swVer"),
+        }
+
+    @property
+    def available(self) -> bool:
+        """Stay available while the hub is down; errors and timeouts still count."""
+
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Return the metric from the API client."""
+
+        return self.entity_description.value_fn(self.coordinator.api)
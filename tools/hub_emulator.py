@@ -0,0 +1,384 @@
+"""Emulator for the Norman hub's local HTTP API.
+
+Serves the ``/cgi-bin/cgi/`` endpoints the integration uses (GatewayLogin,
+GatewayLogout, getRoomInfo, getWindowInfo and RemoteControl) with the
+payload shapes documented in the README, so the API client and coordinator
+can be exercised without a physical hub and at sizes no real install has.
+
+In-process use (e.g. from a benchmark or test)::
+
+    async with NormanHubEmulator(rooms=50, windows_per_room=10) as hub:
+        client = NormanBlindsApiClient(session, hub.host, hub.password)
+
+As a CLI for soak runs::
+
+    python tools/hub_emulator.py --rooms 50 --windows-per-room 10 --port 8080
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import random
+import secrets
+import time
+from typing import Any
+
+from aiohttp import web
+
+DEFAULT_PASSWORD = "123456789"
+SESSION_COOKIE = "sessionid"
+ALLOWED_POSITIONS = (100, 81, 65, 50, 37, 25, 12, 0)
+PRESET_POSITIONS = {"fullopen": 0, "fullclose": 100, "Favorite": 37}
+
+
+class _Blind:
+    """A blind whose position moves towards its target over the travel time."""
+
+    def __init__(self, window_id: int, room_id: int, sort: int, position: int) -> None:
+        self.window_id = window_id
+        self.room_id = room_id
+        self.sort = sort
+        self.start_position = position
+        self.target = position
+        self.started = 0.0
+
+    def position(self, travel_time: float, now: float) -> int:
+        """Return the reported position at ``now``."""
+
+        if travel_time <= 0 or self.target == self.start_position:
+            return self.target
+        span = abs(self.target - self.start_position)
+        progress = min(1.0, (now - self.started) / (travel_time * span / 100))
+        return round(self.start_position + (self.target - self.start_position) * progress)
+
+    def move(self, target: int, travel_time: float, now: float) -> None:
+        """Start moving to ``target`` from wherever the blind is now."""
+
+        self.start_position = self.position(travel_time, now)
+        self.target = target
+        self.started = now
+
+
+class NormanHubEmulator:
+    """A configurable fake Norman hub served by aiohttp.
+
+    ``latency`` (plus up to ``jitter``) is added to every request.
+    ``single_connection`` makes the hub handle one request at a time like
+    the embedded CGI server, and ``keep_alive=False`` closes every
+    connection after its response. ``travel_time`` is how long a blind
+    takes for a full 0-100 move. ``session_lifetime`` expires sessions,
+    after which data endpoints answer ``{"error": -2}``. ``error_rate``,
+    ``drop_rate`` and ``hang_rate`` inject HTTP 500s, dropped connections
+    and requests that hang for ``hang_time`` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        rooms: int = 2,
+        windows_per_room: int = 3,
+        password: str = DEFAULT_PASSWORD,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        single_connection: bool = False,
+        keep_alive: bool = True,
+        travel_time: float = 0.0,
+        session_lifetime: float | None = None,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        hang_time: float = 30.0,
+        seed: int | None = None,
+    ) -> None:
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.single_connection = single_connection
+        self.keep_alive = keep_alive
+        self.travel_time = travel_time
+        self.session_lifetime = session_lifetime
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.hang_rate = hang_rate
+        self.hang_time = hang_time
+        self.host = ""
+        self.requests: dict[str, int] = {}
+        self.max_concurrency = 0
+        self._random = random.Random(seed)
+        self._sessions: dict[str, float] = {}
+        self._in_flight = 0
+        self._lock = asyncio.Lock()
+        self._runner: web.AppRunner | None = None
+
+        ids = itertools.count(1001)
+        self.rooms: list[dict[str, Any]] = []
+        self.blinds: dict[int, _Blind] = {}
+        for room_index in range(rooms):
+            room_id = next(ids)
+            self.rooms.append(
+                {
+                    "groupname": ["Left", "Middle", "Right", "All", "group5"],
+                    "Id": room_id,
+                    "Name": f"Room {room_index + 1}",
+                    "Color": room_index % 12,
+                    "Style": 1,
+                    "Sort": room_index,
+                }
+            )
+            for _ in range(windows_per_room):
+                window_id = next(ids)
+                self.blinds[window_id] = _Blind(
+                    window_id,
+                    room_id,
+                    len(self.blinds),
+                    self._random.choice(ALLOWED_POSITIONS),
+                )
+
+    async def __aenter__(self) -> NormanHubEmulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return ``host:port`` for the API client."""
+
+        app = web.Application()
+        app.router.add_post("/cgi-bin/cgi/{endpoint}", self._handle)
+        self._runner = web.AppRunner(app, keepalive_timeout=75 if self.keep_alive else 0)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.host = f"{host}:{bound_port}"
+        return self.host
+
+    async def stop(self) -> None:
+        """Stop serving and close open connections."""
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def expire_sessions(self) -> None:
+        """Invalidate every session, as the hub does after its session lifetime."""
+
+        self._sessions.clear()
+
+    def window_position(self, window_id: int) -> int:
+        """Return the position a blind currently reports."""
+
+        return self.blinds[window_id].position(self.travel_time, time.monotonic())
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        endpoint = request.match_info["endpoint"]
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        if self.single_connection:
+            async with self._lock:
+                return await self._serve(request, endpoint)
+        return await self._serve(request, endpoint)
+
+    async def _serve(self, request: web.Request, endpoint: str) -> web.StreamResponse:
+        self._in_flight += 1
+        self.max_concurrency = max(self.max_concurrency, self._in_flight)
+        try:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            if delay:
+                await asyncio.sleep(delay)
+            roll = self._random.random()
+            if roll < self.drop_rate:
+                if request.transport is not None:
+                    request.transport.close()
+                raise web.HTTPInternalServerError()
+            if roll < self.drop_rate + self.hang_rate:
+                await asyncio.sleep(self.hang_time)
+            elif roll < self.drop_rate + self.hang_rate + self.error_rate:
+                raise web.HTTPInternalServerError()
+
+            try:
+                body = await request.json()
+            except ValueError:
+                body = {}
+            response = self._dispatch(request, endpoint, body)
+            if not self.keep_alive:
+                response.force_close()
+            return response
+        finally:
+            self._in_flight -= 1
+
+    def _dispatch(
+        self, request: web.Request, endpoint: str, body: dict[str, Any]
+    ) -> web.Response:
+        data, token = self.respond(endpoint, body, request.cookies.get(SESSION_COOKIE))
+        response = web.json_response(data)
+        if token is not None:
+            response.set_cookie(SESSION_COOKIE, token)
+        return response
+
+    def respond(
+        self, endpoint: str, body: dict[str, Any], session: str | None = None
+    ) -> tuple[dict[str, Any], str | None]:
+        """Answer one request without HTTP.
+
+        Returns the JSON body and, for a successful login, the new session
+        token. Latency and fault injection only apply to HTTP requests.
+        """
+
+        if endpoint == "GatewayLogin":
+            return self._login(body)
+        if endpoint == "GatewayLogout":
+            self._sessions.pop(session or "", None)
+            return {"status": "Success"}, None
+        if not self._session_valid(session):
+            return {"error": -2}, None
+        if endpoint == "getRoomInfo":
+            return {"totalRooms": len(self.rooms), "rooms": self.rooms}, None
+        if endpoint == "getWindowInfo":
+            windows = [self._window_payload(blind) for blind in self.blinds.values()]
+            return {"totalWindow": len(windows), "windows": windows}, None
+        if endpoint == "RemoteControl":
+            return self._remote_control(body), None
+        return {"error": -1}, None
+
+    def _login(self, body: dict[str, Any]) -> tuple[dict[str, Any], str | None]:
+        if body.get("password") != self.password:
+            return {"errorCode": 1}, None
+        token = secrets.token_hex(8)
+        self._sessions[token] = time.monotonic()
+        return (
+            {
+                "initiated": "0",
+                "hubName": "emulator",
+                "hubId": "MBAHUB_EMU001",
+                "swVer": "2.0.7.15(1.0.2)",
+                "needUpdate": "0",
+                "admin": 0,
+            },
+            token,
+        )
+
+    def _session_valid(self, token: str | None) -> bool:
+        started = self._sessions.get(token or "")
+        if started is None:
+            return False
+        if self.session_lifetime is not None and time.monotonic() - started > self.session_lifetime:
+            del self._sessions[token or ""]
+            return False
+        return True
+
+    def _remote_control(self, body: dict[str, Any]) -> dict[str, Any]:
+        command = body.get("type")
+        try:
+            target_id = int(body.get("id"))
+        except (TypeError, ValueError):
+            return {"error": -1}
+        now = time.monotonic()
+        if command == "window":
+            blinds = [self.blinds[target_id]] if target_id in self.blinds else []
+            position = _position(body.get("action"))
+        elif command == "level":
+            blinds = [blind for blind in self.blinds.values() if blind.room_id == target_id]
+            position = _position(body.get("action"))
+        elif command in PRESET_POSITIONS:
+            blinds = [blind for blind in self.blinds.values() if blind.room_id == target_id]
+            position = PRESET_POSITIONS[command]
+        else:
+            return {"error": -1}
+        if not blinds:
+            return {"error": -1}
+        for blind in blinds:
+            blind.move(position, self.travel_time, now)
+        return {"status": "Success"}
+
+    def _window_payload(self, blind: _Blind) -> dict[str, Any]:
+        return {
+            "Id": blind.window_id,
+            "Name": f"Id {blind.window_id:04x}",
+            "Level": 0,
+            "Sort": blind.sort,
+            "RId": blind.room_id,
+            "roomId": blind.room_id,
+            "scenes": [{"Id": 0, "Position": 0, "Angle": 0}],
+            "groupId": 10,
+            "level": [0, 1, 0, 1, 0],
+            "levelsort": [0, 1, 0, 1, 0],
+            "battery": "100",
+            "position": blind.position(self.travel_time, time.monotonic()),
+            "angle": 0,
+            "model": 1,
+            "Rssi": 65,
+            "temp": 21,
+            "ver": "0.6.8",
+            "solar": 65535,
+            "usb": 0,
+            "speed": 0,
+            "model_detail": 0,
+        }
+
+
+def _position(action: Any) -> int:
+    """Map a RemoteControl action to a position; unknown values act like 0."""
+
+    try:
+        position = int(action)
+    except (TypeError, ValueError):
+        return 0
+    return position if position in ALLOWED_POSITIONS else 0
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--rooms", type=int, default=2)
+    parser.add_argument("--windows-per-room", type=int, default=3)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, seconds")
+    parser.add_argument("--single-connection", action="store_true", help="serve one request at a time")
+    parser.add_argument("--no-keep-alive", action="store_true", help="close every connection")
+    parser.add_argument("--travel-time", type=float, default=0.0, help="seconds for a full move")
+    parser.add_argument("--session-lifetime", type=float, default=None, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction answered with 500")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of connections dropped")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="fraction of requests that hang")
+    parser.add_argument("--hang-time", type=float, default=30.0, help="seconds a hung request waits")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--report-every", type=float, default=60.0, help="seconds between stats lines")
+    return parser.parse_args()
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    emulator = NormanHubEmulator(
+        rooms=args.rooms,
+        windows_per_room=args.windows_per_room,
+        password=args.password,
+        latency=args.latency,
+        jitter=args.jitter,
+        single_connection=args.single_connection,
+        keep_alive=not args.no_keep_alive,
+        travel_time=args.travel_time,
+        session_lifetime=args.session_lifetime,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        hang_rate=args.hang_rate,
+        hang_time=args.hang_time,
+        seed=args.seed,
+    )
+    host = await emulator.start(args.host, args.port)
+    print(f"Norman hub emulator with {len(emulator.blinds)} blinds listening on http://{host}")
+    try:
+        while True:
+            await asyncio.sleep(args.report_every)
+            print(f"requests={emulator.requests} max_concurrency={emulator.max_concurrency}")
+    finally:
+        await emulator.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_async_main(_parse_args()))
+    except KeyboardInterrupt:
+        pass